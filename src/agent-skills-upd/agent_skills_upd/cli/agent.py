@@ -4,13 +4,7 @@ from typing import Annotated
 
 import typer
 
-from agent_skills_upd.cli.common import fetch_spinner, get_destination, parse_resource_ref, print_success_message
-from agent_skills_upd.exceptions import (
-    SkillUpdError,
-    RepoNotFoundError,
-    ResourceExistsError,
-    ResourceNotFoundError,
-)
+from agent_skills_upd.cli.common import fetch_spinner, get_destination, handle_errors, parse_errors, parse_resource_ref, print_success_message
 from agent_skills_upd.fetcher import ResourceType, fetch_resource
 
 app = typer.Typer(
@@ -20,6 +14,7 @@ app = typer.Typer(
 
 
 @app.command()
+@handle_errors
 def add(
     agent_ref: Annotated[
         str,
@@ -78,11 +73,8 @@ def add(
         agent-upd kasperjunge/code-reviewer
         agent-upd kasperjunge/test-writer --global
     """
-    try:
+    with parse_errors():
         host, username, agent_name = parse_resource_ref(agent_ref)
-    except typer.BadParameter as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
 
     dest_path = get_destination(
         "agents",
@@ -90,32 +82,20 @@ def add(
         dest if dest else None,
         environment if environment else None,
     )
+    dest_path.mkdir(parents=True, exist_ok=True)
     scope = "user" if global_install else "project"
 
-    try:
-        with fetch_spinner():
-            agent_path = fetch_resource(
-                username,
-                agent_name,
-                dest_path,
-                ResourceType.AGENT,
-                overwrite,
-                host=host,
-                repo=repo,
-            )
-        print_success_message("agent", host, agent_name, username)
-    except RepoNotFoundError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except ResourceNotFoundError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except ResourceExistsError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except SkillUpdError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
+    with fetch_spinner():
+        agent_path = fetch_resource(
+            username,
+            agent_name,
+            dest_path,
+            ResourceType.AGENT,
+            overwrite,
+            host=host,
+            repo=repo,
+        )
+    print_success_message("agent", host, agent_name, username)
 
 
 if __name__ == "__main__":
@@ -1,79 +1,125 @@
 """Shared CLI utilities for skill-upd, command-upd, and agent-upd."""
 
 import random
+import re
+from collections.abc import Callable, Mapping
 from contextlib import contextmanager
+from functools import cache, lru_cache, wraps
 from pathlib import Path
-from urllib.parse import urlparse
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 
 import typer
-import yaml
-from rich.console import Console
-from rich.live import Live
-from rich.spinner import Spinner
-
-console = Console()
-
-# Default environment configurations
-DEFAULT_ENVIRONMENTS = {
-    "claude": {
-        "skill_dir": ".claude/skills",
-        "command_dir": ".claude/commands",
-        "agent_dir": ".claude/agents",
-        "global_skill_dir": ".claude/skills",
-    },
-    "opencode": {
-        "skill_dir": ".opencode/skill",
-        "command_dir": ".opencode/command",
-        "agent_dir": ".opencode/agent",
-        "global_skill_dir": ".config/opencode/skill",
-        "global_command_dir": ".config/opencode/command",
-        "global_agent_dir": ".config/opencode/agent",
-    },
-    "codex": {
-        "skill_dir": ".codex/skills",
-        "command_dir": ".codex/commands",
-        "agent_dir": ".codex/agents",
-    },
+
+from agent_skills_upd.exceptions import SkillUpdError
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+__all__ = [
+    "DEFAULT_ENVIRONMENTS",
+    "fetch_spinner",
+    "get_destination",
+    "get_environment_config",
+    "handle_errors",
+    "parse_errors",
+    "parse_resource_ref",
+    "print_success_message",
+]
+
+# The home directory cannot change under a running CLI; the cwd can, so it stays live
+_HOME = Path.home()
+_CONFIG_PATH = _HOME / ".agent-resources-config.yaml"
+
+# Default environment configurations, frozen so every cached lookup can
+# share them without copying
+DEFAULT_ENVIRONMENTS: dict[str, Mapping[str, str]] = {
+    "claude": MappingProxyType(
+        {
+            "skill_dir": ".claude/skills",
+            "command_dir": ".claude/commands",
+            "agent_dir": ".claude/agents",
+            "global_skill_dir": ".claude/skills",
+        }
+    ),
+    "opencode": MappingProxyType(
+        {
+            "skill_dir": ".opencode/skill",
+            "command_dir": ".opencode/command",
+            "agent_dir": ".opencode/agent",
+            "global_skill_dir": ".config/opencode/skill",
+            "global_command_dir": ".config/opencode/command",
+            "global_agent_dir": ".config/opencode/agent",
+        }
+    ),
+    "codex": MappingProxyType(
+        {
+            "skill_dir": ".codex/skills",
+            "command_dir": ".codex/commands",
+            "agent_dir": ".codex/agents",
+        }
+    ),
     # https://ampcode.com/news/agent-skills
-    "amp": {
-        "skill_dir": ".agents/skills",
-        "global_skill_dir": ".config/agents/skills",
-    },
+    "amp": MappingProxyType(
+        {
+            "skill_dir": ".agents/skills",
+            "global_skill_dir": ".config/agents/skills",
+        }
+    ),
     # ampcode is an alias to amp
-    "ampcode": {
-        "skill_dir": ".agents/skills",
-        "global_skill_dir": ".config/agents/skills",
-    },
+    "ampcode": MappingProxyType(
+        {
+            "skill_dir": ".agents/skills",
+            "global_skill_dir": ".config/agents/skills",
+        }
+    ),
     # https://docs.clawd.bot/tools/skills#skills
-    "clawdbot": {
-        "skill_dir": "skills",
-        "global_skill_dir": ".config/clawdbot/skills",
-    },
+    "clawdbot": MappingProxyType(
+        {
+            "skill_dir": "skills",
+            "global_skill_dir": ".config/clawdbot/skills",
+        }
+    ),
     # clawdis is the old name of clawdbot
-    "clawdis": {
-        "skill_dir": "skills",
-        "global_skill_dir": ".config/clawdbot/skills",
-    },
+    "clawdis": MappingProxyType(
+        {
+            "skill_dir": "skills",
+            "global_skill_dir": ".config/clawdbot/skills",
+        }
+    ),
     # clawd is an alias to clawdbot
-    "clawd": {
-        "skill_dir": "skills",
-        "global_skill_dir": ".config/clawdbot/skills",
-    }
+    "clawd": MappingProxyType(
+        {
+            "skill_dir": "skills",
+            "global_skill_dir": ".config/clawdbot/skills",
+        }
+    ),
 }
 
 
-def get_environment_config(environment: str | None = None) -> dict:
-    """Simple config loading - no caching, no complexity."""
-    config_path = Path.home() / ".agent-resources-config.yaml"
+@lru_cache(maxsize=None)
+def _load_environments(config_mtime_ns: int | None) -> Mapping[str, Mapping[str, str]]:
+    """Merge user config with defaults, cached per config file mtime."""
+    if config_mtime_ns is None:
+        return DEFAULT_ENVIRONMENTS
+
+    import yaml
+
+    with _CONFIG_PATH.open("r") as file_handle:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        user_config = yaml.load(file_handle, Loader=loader) or {}
+
+    return {**DEFAULT_ENVIRONMENTS, **user_config.get("environments", {})}
 
-    # Load user config if exists
-    user_config: dict = {}
-    if config_path.exists():
-        with config_path.open("r") as file_handle:
-            user_config = yaml.safe_load(file_handle) or {}
 
-    # Merge with defaults - simple and straightforward
-    environments = {**DEFAULT_ENVIRONMENTS, **user_config.get("environments", {})}
+def get_environment_config(environment: str | None = None) -> Mapping[str, str]:
+    """Look up an environment, re-reading the user config only when it changes."""
+    try:
+        config_mtime_ns = _CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        config_mtime_ns = None
+
+    environments = _load_environments(config_mtime_ns)
 
     # Default to claude if no environment specified
     env_name = environment or "claude"
@@ -86,6 +132,21 @@ def get_environment_config(environment: str | None = None) -> dict:
     return environments[env_name]
 
 
+# scheme://netloc/path, split the way urllib.parse.urlsplit does; the query
+# and fragment are dropped. Like urlsplit, leading C0 controls and spaces are
+# stripped and tabs and newlines removed first.
+_URL_LEADING_JUNK = "".join(map(chr, range(0x21)))
+_URL_UNSAFE_CHARS = str.maketrans("", "", "\t\r\n")
+_URL_RE = re.compile(
+    r"^(?:[A-Za-z][A-Za-z0-9+.-]*:)?(?://(?P<netloc>[^/?#]*))?(?P<path>[^?#]*)"
+)
+# [host.with.dot/] username/name[/], ignoring empty path segments
+_PATH_RE = re.compile(
+    r"^/*(?:(?P<host>[^/]*\.[^/]*)/+)?(?P<username>[^/]+)/+(?P<name>[^/]+)/*$"
+)
+
+
+@lru_cache(maxsize=256)
 def parse_resource_ref(ref: str) -> tuple[str, str, str]:
     """
     Parse '<username>/<name>' into components, with optional host.
@@ -108,31 +169,35 @@ def parse_resource_ref(ref: str) -> tuple[str, str, str]:
     path = ref
 
     if "://" in ref:
-        parsed = urlparse(ref)
-        if not parsed.netloc:
+        url = _URL_RE.match(
+            ref.lstrip(_URL_LEADING_JUNK).translate(_URL_UNSAFE_CHARS)
+        )
+        # urlsplit raises ValueError for unbalanced IPv6 brackets instead
+        if (
+            url is None
+            or not url.group("netloc")
+            or ("[" in url.group("netloc")) != ("]" in url.group("netloc"))
+        ):
             raise typer.BadParameter(
                 f"Invalid format: '{ref}'. Expected: <username>/<name> or URL."
             )
-        host = parsed.netloc
-        path = parsed.path.lstrip("/")
-
-    parts = [part for part in path.split("/") if part]
-    if len(parts) == 3 and host == "github.com" and "." in parts[0]:
-        host, username, name = parts
-    elif len(parts) == 2:
-        username, name = parts
-    else:
+        host = url.group("netloc")
+        path = url.group("path")
+
+    match = _PATH_RE.match(path)
+    # A leading host segment is only read from github.com refs
+    if match is not None and match.group("host") is not None:
+        if host != "github.com":
+            match = None
+        else:
+            host = match.group("host")
+
+    name = match.group("name").removesuffix(".git") if match else ""
+    if not name:
         raise typer.BadParameter(
             f"Invalid format: '{ref}'. Expected: <username>/<name> or <host>/<username>/<name>"
         )
-
-    if name.endswith(".git"):
-        name = name[: -len(".git")]
-    if not username or not name:
-        raise typer.BadParameter(
-            f"Invalid format: '{ref}'. Expected: <username>/<name> or <host>/<username>/<name>"
-        )
-    return host, username, name
+    return host, match.group("username"), name
 
 
 def get_destination(
@@ -167,15 +232,36 @@ def get_destination(
     env_dir = env_config.get(key, env_config[key.replace("global_", "")])
 
     # Determine base path
-    base = Path.home() if global_install else Path.cwd()
+    base = _HOME if global_install else Path.cwd()
 
     return base / env_dir
 
 
+# Rotating call-to-action lines; one is picked before any interpolation
+_CTA_TEMPLATES = (
+    "💡 Create your own {resource_type} library on GitHub: uvx create-agent-skill-repo --github",
+    "⭐ Star project: github.com/xlab/agent-skills-project",
+    "🔭 Explore more skills: https://upd.dev/skills",
+    "🦞 More skills on ClawdHub: https://clawdhub.com",
+    "📢 Share: uvx upd-{resource_type} {host_visible}{username_visible}{share_ref}",
+)
+
+
+@cache
+def _console() -> "Console":
+    """Create the shared rich console on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
 @contextmanager
 def fetch_spinner():
     """Show spinner during fetch operation."""
-    with Live(Spinner("dots", text="Fetching..."), console=console, transient=True):
+    from rich.live import Live
+    from rich.spinner import Spinner
+
+    with Live(Spinner("dots", text="Fetching..."), console=_console(), transient=True):
         yield
 
 
@@ -187,6 +273,7 @@ def print_success_message(
     share_name: str | None = None,
 ) -> None:
     """Print branded success message with rotating CTA."""
+    console = _console()
     console.print(f"✅ Installed {resource_type} '{name}' via 🧩 agent-skills-upd", style="dim")
 
     username_visible = username + "/"
@@ -196,12 +283,37 @@ def print_success_message(
     elif host == "clawdhub.com":
         username_visible = ""
 
-    share_ref = share_name or name
-    ctas = [
-        f"💡 Create your own {resource_type} library on GitHub: uvx create-agent-skill-repo --github",
-        "⭐ Star project: github.com/xlab/agent-skills-project",
-        "🔭 Explore more skills: https://upd.dev/skills",
-        "🦞 More skills on ClawdHub: https://clawdhub.com",
-        f"📢 Share: uvx upd-{resource_type} {host_visible}{username_visible}{share_ref}",
-    ]
-    console.print(random.choice(ctas), style="dim")
+    cta = random.choice(_CTA_TEMPLATES).format(
+        resource_type=resource_type,
+        host_visible=host_visible,
+        username_visible=username_visible,
+        share_ref=share_name or name,
+    )
+    console.print(cta, style="dim")
+
+
+@contextmanager
+def parse_errors():
+    """Turn BadParameter from parsing refs and flags into a SkillUpdError.
+
+    Other BadParameter errors (e.g. an unknown --env) keep typer's usage
+    error and exit status 2.
+    """
+    try:
+        yield
+    except typer.BadParameter as e:
+        raise SkillUpdError(str(e)) from e
+
+
+def handle_errors(func: Callable) -> Callable:
+    """Report fetch and parse errors as `Error: ...` and exit with status 1."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except SkillUpdError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+    return wrapper
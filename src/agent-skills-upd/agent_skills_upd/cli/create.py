@@ -5,12 +5,7 @@ from typing import Annotated
 
 import typer
 
-from agent_skills_upd.github import (
-    check_gh_cli,
-    create_github_repo,
-    get_github_username,
-    repo_exists,
-)
+from agent_skills_upd.github import create_github_repo, gh_preflight
 from agent_skills_upd.scaffold import create_agent_skills_upd_repo, init_git
 
 app = typer.Typer(
@@ -60,7 +55,8 @@ def create(
     # Get username for README (if GitHub integration enabled)
     username = "<username>"
     if github:
-        if not check_gh_cli():
+        authenticated, gh_username, gh_repo_exists = gh_preflight()
+        if not authenticated:
             typer.echo(
                 "Error: GitHub CLI (gh) is not installed or not authenticated.",
                 err=True,
@@ -70,7 +66,7 @@ def create(
             raise typer.Exit(1)
 
         # Check if repo already exists on GitHub
-        if repo_exists():
+        if gh_repo_exists:
             typer.echo(
                 "Error: Repository 'agent-resources' already exists on GitHub.",
                 err=True,
@@ -81,7 +77,7 @@ def create(
             )
             raise typer.Exit(1)
 
-        username = get_github_username() or "<username>"
+        username = gh_username or "<username>"
 
     # Create the repository structure
     typer.echo(f"Creating agent-resources repository at {output_path}...")
@@ -1,26 +1,28 @@
 """CLI for skill-upd command."""
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import Annotated
-from urllib.parse import urlparse
 
 import typer
 
 from agent_skills_upd.cli.common import (
     fetch_spinner,
     get_destination,
+    handle_errors,
+    parse_errors,
     parse_resource_ref,
     print_success_message,
 )
-from agent_skills_upd.exceptions import (
-    SkillUpdError,
-    RepoNotFoundError,
-    ResourceExistsError,
-    ResourceNotFoundError,
-)
+from agent_skills_upd.exceptions import SkillUpdError
 from agent_skills_upd.fetcher import (
     CLAWDHUB_HOST,
     ResourceType,
+    ClawdhubFetchResult,
     fetch_clawdhub_skill,
+    fetch_many,
     fetch_resource,
 )
 
@@ -29,52 +31,156 @@ app = typer.Typer(
     help="Update Claude Code skills from GitHub to your project.",
 )
 
+_OVERWRITE_TRUE = frozenset({"1", "true", "yes", "y", "on"})
+_OVERWRITE_FALSE = frozenset({"0", "false", "no", "n", "off"})
+_CLAWD_ENVS = frozenset({"clawd", "clawdbot", "clawdis"})
+
+
+_CLAWDHUB_HOST_PATTERN = re.escape(CLAWDHUB_HOST)
+# A well-formed ref, capturing the slug from either the URL or bare form
+_CLAWDHUB_REF_RE = re.compile(
+    rf"^(?:https?://{_CLAWDHUB_HOST_PATTERN}(?=[/?#]|$)/*(?P<url_slug>[^/?#]+)/*"
+    rf"(?:[?#].*)?|{_CLAWDHUB_HOST_PATTERN}/+(?P<slug>[^/]+)/*)$",
+    re.DOTALL,
+)
+# Anything aimed at clawdhub.com, valid or not
+_CLAWDHUB_PREFIX_RE = re.compile(
+    rf"^(?:https?://{_CLAWDHUB_HOST_PATTERN}(?:[/?#]|$)|{_CLAWDHUB_HOST_PATTERN}/)"
+)
+# urlsplit drops these from a URL before splitting it
+_URL_UNSAFE_CHARS = str.maketrans("", "", "\t\r\n")
+
 
+@lru_cache(maxsize=256)
 def parse_clawdhub_skill_ref(ref: str) -> str | None:
     """Parse clawdhub.com/<skill-name> or https://clawdhub.com/<skill-name>."""
     ref = ref.strip()
     if not ref:
         raise typer.BadParameter("Skill reference cannot be empty.")
 
-    if ref.startswith("http://") or ref.startswith("https://"):
-        parsed = urlparse(ref)
-        if parsed.netloc != CLAWDHUB_HOST:
-            return None
-        slug = parsed.path.strip("/")
-    elif ref.startswith(f"{CLAWDHUB_HOST}/"):
-        slug = ref[len(f"{CLAWDHUB_HOST}/") :].strip("/")
-    else:
-        return None
-
-    if not slug or "/" in slug:
+    target = ref
+    if ref.startswith(("http://", "https://")):
+        target = ref.translate(_URL_UNSAFE_CHARS)
+    match = _CLAWDHUB_REF_RE.match(target)
+    if match:
+        return match["url_slug"] or match["slug"]
+    if _CLAWDHUB_PREFIX_RE.match(target):
         raise typer.BadParameter(
             f"Invalid format: '{ref}'. Expected: {CLAWDHUB_HOST}/<skill-name>"
         )
-    return slug
+    return None
 
 
 def parse_overwrite_flag(value: str) -> bool:
     """Parse overwrite flag values like true/false."""
     normalized = value.strip().lower()
-    if normalized in {"1", "true", "yes", "y", "on"}:
+    if normalized in _OVERWRITE_TRUE:
         return True
-    if normalized in {"0", "false", "no", "n", "off"}:
+    if normalized in _OVERWRITE_FALSE:
         return False
     raise typer.BadParameter(
         f"Invalid value for --overwrite: '{value}'. Use true or false."
     )
 
 
+@dataclass(frozen=True, slots=True)
+class ParsedRef:
+    """Where a skill ref points, resolved in one pass."""
+
+    host: str
+    username: str
+    skill_name: str | None
+    use_clawdhub: bool
+    repo_override: str | None = None
+
+
+@lru_cache(maxsize=256)
+def parse_skill_ref(skill_ref: str, environment: str) -> ParsedRef:
+    """Parse a Clawdhub ref, a clawd-environment slug or a repo ref."""
+    clawdhub_slug = parse_clawdhub_skill_ref(skill_ref)
+    if clawdhub_slug:
+        return ParsedRef(CLAWDHUB_HOST, "", clawdhub_slug, True)
+    if environment in _CLAWD_ENVS and "/" not in skill_ref:
+        return ParsedRef("upd.dev", "clawdhub", None, False, repo_override=skill_ref)
+    host, username, skill_name = parse_resource_ref(skill_ref)
+    return ParsedRef(host, username, skill_name, False)
+
+
+def echo_clawdhub_result(result: ClawdhubFetchResult) -> None:
+    """Report a Clawdhub install or version change."""
+    if result.was_existing:
+        old_version = result.old_version or "unknown"
+        typer.echo(f"🔄 Updated from {old_version} -> {result.new_version}")
+    else:
+        typer.echo(f"✅ Installed version {result.new_version}")
+
+
+def add_many(
+    parsed_refs: list[ParsedRef], dest_path: Path, overwrite: bool, repo: str
+) -> None:
+    """Install several skills, downloading the repo-hosted ones concurrently."""
+    hosted = [ref for ref in parsed_refs if not ref.use_clawdhub]
+    clawdhub = [ref for ref in parsed_refs if ref.use_clawdhub]
+
+    with fetch_spinner():
+        results = fetch_many(
+            [
+                {
+                    "username": ref.username,
+                    "name": ref.skill_name,
+                    "dest": dest_path,
+                    "resource_type": ResourceType.SKILL,
+                    "overwrite": overwrite,
+                    "host": ref.host,
+                    "repo": ref.repo_override or repo,
+                }
+                for ref in hosted
+            ]
+        )
+        clawdhub_results = []
+        for ref in clawdhub:
+            try:
+                result = fetch_clawdhub_skill(ref.skill_name, dest_path, overwrite)
+            except SkillUpdError as e:
+                result = e
+            clawdhub_results.append(result)
+
+    failed = False
+    for ref, result in zip(hosted, results):
+        if isinstance(result, SkillUpdError):
+            typer.echo(f"Error: {result}", err=True)
+            failed = True
+        else:
+            print_success_message(
+                "skill",
+                ref.host,
+                result.name,
+                ref.username,
+                share_name=ref.repo_override or repo,
+            )
+    for result in clawdhub_results:
+        if isinstance(result, SkillUpdError):
+            typer.echo(f"Error: {result}", err=True)
+            failed = True
+        else:
+            echo_clawdhub_result(result)
+
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command()
+@handle_errors
 def add(
-    skill_ref: Annotated[
-        str,
+    skill_refs: Annotated[
+        list[str],
         typer.Argument(
             help=(
-                "Skill to update in format: <username>/<skill-name> or "
-                "<host>/<username>/<skill-name> or clawdhub.com/<skill-name>"
+                "Skill(s) to update in format: <username>/<skill-name> or "
+                "<host>/<username>/<skill-name> or clawdhub.com/<skill-name>. "
+                "Several skills are downloaded concurrently."
             ),
-            metavar="USERNAME/SKILL-NAME",
+            metavar="USERNAME/SKILL-NAME...",
         ),
     ],
     overwrite: Annotated[
@@ -124,28 +230,13 @@ def add(
     Example:
         skill-upd kasperjunge/analyze-paper
         skill-upd kasperjunge/analyze-paper --global
+        skill-upd kasperjunge/analyze-paper kasperjunge/write-tests
     """
-    try:
+    with parse_errors():
         overwrite_value = parse_overwrite_flag(overwrite)
-        clawd_envs = {"clawd", "clawdbot", "clawdis"}
-        clawdhub_slug = parse_clawdhub_skill_ref(skill_ref)
-        if clawdhub_slug:
-            host = CLAWDHUB_HOST
-            username = ""
-            skill_name = clawdhub_slug
-            use_clawdhub = True
-        elif environment in clawd_envs and "/" not in skill_ref:
-            host = "upd.dev"
-            username = "clawdhub"
-            skill_name = None
-            repo = skill_ref
-            use_clawdhub = False
-        else:
-            host, username, skill_name = parse_resource_ref(skill_ref)
-            use_clawdhub = False
-    except typer.BadParameter as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
+        parsed_refs = [
+            parse_skill_ref(skill_ref, environment) for skill_ref in skill_refs
+        ]
 
     dest_path = get_destination(
         "skills",
@@ -153,51 +244,40 @@ def add(
         dest if dest else None,
         environment if environment else None,
     )
+    dest_path.mkdir(parents=True, exist_ok=True)
     scope = "user" if global_install else "project"
 
-    try:
-        with fetch_spinner():
-            if use_clawdhub:
-                clawdhub_result = fetch_clawdhub_skill(
-                    skill_name,
-                    dest_path,
-                    overwrite_value,
-                )
-            else:
-                skill_path = fetch_resource(
-                    username,
-                    skill_name,
-                    dest_path,
-                    ResourceType.SKILL,
-                    overwrite_value,
-                    host=host,
-                    repo=repo,
-                )
-        if use_clawdhub:
-            if clawdhub_result.was_existing:
-                old_version = clawdhub_result.old_version or "unknown"
-                typer.echo(
-                    f"🔄 Updated from {old_version} -> {clawdhub_result.new_version}"
-                )
-            else:
-                typer.echo(f"✅ Installed version {clawdhub_result.new_version}")
+    if len(parsed_refs) > 1:
+        add_many(parsed_refs, dest_path, overwrite_value, repo)
+        return
+
+    parsed = parsed_refs[0]
+    host, username, skill_name = parsed.host, parsed.username, parsed.skill_name
+    repo = parsed.repo_override or repo
+    with fetch_spinner():
+        if parsed.use_clawdhub:
+            clawdhub_result = fetch_clawdhub_skill(
+                skill_name,
+                dest_path,
+                overwrite_value,
+            )
         else:
-            skill_name = skill_path.name
-            print_success_message(
-                "skill", host, skill_name, username, share_name=repo
+            skill_path = fetch_resource(
+                username,
+                skill_name,
+                dest_path,
+                ResourceType.SKILL,
+                overwrite_value,
+                host=host,
+                repo=repo,
             )
-    except RepoNotFoundError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except ResourceNotFoundError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except ResourceExistsError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-    except SkillUpdError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
+    if parsed.use_clawdhub:
+        echo_clawdhub_result(clawdhub_result)
+    else:
+        skill_name = skill_path.name
+        print_success_message(
+            "skill", host, skill_name, username, share_name=repo
+        )
 
 
 if __name__ == "__main__":
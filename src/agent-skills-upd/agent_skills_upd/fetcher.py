@@ -1,17 +1,26 @@
 """Generic resource fetcher for skills, commands, and agents."""
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
 import io
 import json
+import os
+import posixpath
+import re
 import shutil
-import tarfile
+import stat
+import sys
 import tempfile
+import threading
 import zipfile
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-
-import frontmatter
-import httpx
+from typing import TYPE_CHECKING
 
 from agent_skills_upd.exceptions import (
     SkillUpdError,
@@ -20,6 +29,13 @@ from agent_skills_upd.exceptions import (
     ResourceNotFoundError,
 )
 
+# httpx, tarfile and frontmatter are imported where used so that --help and
+# argument errors don't pay for them
+if TYPE_CHECKING:
+    import tarfile
+
+    import httpx
+
 
 class ResourceType(Enum):
     """Type of resource to fetch."""
@@ -89,6 +105,70 @@ RESOURCE_SEARCH_PATTERNS = {
 # Name of the repository to fetch resources from
 REPO_NAME = "agent-resources"
 
+# Read size for streamed tarball downloads (a 256 KiB window)
+DOWNLOAD_CHUNK_SIZE = 1 << 18
+
+# Write size for extracted tar members; tarfile defaults to 16 KiB
+EXTRACT_BUFFER_SIZE = 2 << 20
+
+# Extracted files up to this size are written by a small thread pool while
+# the tar stream keeps decompressing; bigger ones go through tarfile
+POOLED_WRITE_MAX_SIZE = 1 << 20
+EXTRACT_WRITE_WORKERS = 4
+
+# Buffer for user-space file copies when no in-kernel copy is available
+COPY_BUFFER_SIZE = 1 << 20
+
+# Chunks buffered between an async download and its extraction thread
+ASYNC_QUEUE_CHUNKS = 8
+
+# Serializes read-modify-write of the cache's JSON indexes between
+# concurrent fetches
+_CACHE_INDEX_LOCK = threading.Lock()
+
+# Single files from GitHub repos whose layout is already known are fetched
+# individually instead of through the whole tarball
+RAW_GITHUB_URL = "https://raw.githubusercontent.com"
+
+# Tarball URLs whose cached copy this process has downloaded or revalidated;
+# later fetches from the same repo skip the network entirely
+_CURRENT_TARBALLS: set[str] = set()
+
+# Parallel gzip inflate needs the optional rapidgzip package
+# (pip install agent-skills-upd[rapidgzip]); small archives aren't worth it
+RAPIDGZIP_AVAILABLE = importlib.util.find_spec("rapidgzip") is not None
+PARALLEL_GZIP_THRESHOLD = 8 << 20
+
+# HTTP/2 needs the optional h2 package (pip install agent-skills-upd[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_CLIENT: "httpx.Client | None" = None
+
+# SKILL.md prefix scanned for a `name:` key before falling back to full YAML
+FRONTMATTER_HEAD_SIZE = 4096
+_FRONTMATTER_NAME_RE = re.compile(
+    rb"^name:[ \t]+([\"']?)([A-Za-z0-9][A-Za-z0-9_.-]*)\1[ \t]*(?:#[^\n]*)?\r?$",
+    re.MULTILINE,
+)
+_FRONTMATTER_OPEN_RE = re.compile(rb"---\r?\n")
+_FRONTMATTER_CLOSE_RE = re.compile(rb"^-{3,}[ \t]*\r?$", re.MULTILINE)
+# One `key: value` line of a flat mapping; the value is checked separately
+_FRONTMATTER_ENTRY_RE = re.compile(
+    rb"([A-Za-z0-9_][A-Za-z0-9_.-]*):(?:[ \t]+(.*?))?[ \t]*\r?"
+)
+_FRONTMATTER_QUOTED_RE = re.compile(rb"'[^'\n]*'|\"[^\"\\\n]*\"")
+# Characters that can't start a plain YAML scalar, or change its meaning
+_YAML_INDICATORS = frozenset(b"-?:,[]{}#&*!|>'\"%@`")
+_YAML_SCALAR_WORDS = frozenset(
+    {"null", "true", "false", "yes", "no", "on", "off", "y", "n", ".nan", ".inf"}
+)
+
+# Linux FICLONE ioctl request number: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+# Characters allowed verbatim in tarball cache file names
+_UNSAFE_CACHE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
 CLAWDHUB_HOST = "clawdhub.com"
 CLAWDHUB_DOWNLOAD_URL = "https://auth.clawdhub.com/api/download"
 CLAWDHUB_METADATA_URL = "https://auth.clawdhub.com/api/skill"
@@ -107,14 +187,77 @@ class ClawdhubFetchResult:
 
 def find_root_skill_file(repo_dir: Path) -> Path | None:
     """Find a root-level SKILL.md file case-insensitively."""
-    for path in sorted(repo_dir.iterdir(), key=lambda entry: entry.name.lower()):
-        if path.is_file() and path.name.lower() == "skill.md":
-            return path
+    with os.scandir(repo_dir) as entries:
+        for entry in entries:
+            if entry.name.lower() == "skill.md" and entry.is_file():
+                return Path(entry.path)
     return None
 
 
+def _flat_frontmatter_keys(block: bytes) -> list[bytes] | None:
+    """Keys of a frontmatter block made only of `key: scalar` lines.
+
+    Returns None for anything else (nesting, tabs, flow collections,
+    multi-line or ambiguous scalars), which needs the YAML parser.
+    """
+    keys = []
+    for line in block.splitlines():
+        if not line.strip(b" ") or line.startswith(b"#"):
+            continue
+        entry = _FRONTMATTER_ENTRY_RE.fullmatch(line)
+        if entry is None:
+            return None
+        value = re.split(rb"[ \t]#", entry.group(2) or b"", maxsplit=1)[0].rstrip()
+        if value[:1] in (b"'", b'"'):
+            if _FRONTMATTER_QUOTED_RE.fullmatch(value) is None:
+                return None
+        elif value and (
+            value[0] in _YAML_INDICATORS
+            or re.search(rb":([ \t]|$)", value) is not None
+        ):
+            return None
+        keys.append(entry.group(1))
+    return keys
+
+
+def _fast_frontmatter_name(skill_file: Path) -> str | None:
+    """Read `name:` from the leading frontmatter block without a YAML parser.
+
+    Only handles a flat block of simple scalars whose `name` is a plain slug
+    that YAML would load as the same string; anything else returns None so
+    the caller falls back to a full parse.
+    """
+    with skill_file.open("rb") as file_handle:
+        head = file_handle.read(FRONTMATTER_HEAD_SIZE)
+    opener = _FRONTMATTER_OPEN_RE.match(head)
+    if opener is None:
+        return None
+    start = opener.end()
+    closer = _FRONTMATTER_CLOSE_RE.search(head, start)
+    if closer is None:
+        return None
+    end = closer.start()
+
+    keys = _flat_frontmatter_keys(head[start:end])
+    if keys is None or keys.count(b"name") != 1:
+        return None
+    match = _FRONTMATTER_NAME_RE.search(head, start, end)
+    if match is None:
+        return None
+    quote, value = match.group(1), match.group(2).decode("ascii")
+    if not quote and (not value[0].isalpha() or value.lower() in _YAML_SCALAR_WORDS):
+        return None  # YAML would turn these into bools/numbers/null
+    return value
+
+
 def parse_frontmatter_name(skill_file: Path) -> tuple[str | None, str | None]:
     """Parse the skill name from frontmatter."""
+    name = _fast_frontmatter_name(skill_file)
+    if name:
+        return name, None
+
+    import frontmatter
+
     content = skill_file.read_text(encoding="utf-8")
     try:
         post = frontmatter.loads(content)
@@ -170,6 +313,8 @@ def select_archive_root(extract_path: Path) -> Path:
 
 def extract_archive(archive_bytes: bytes, extract_path: Path) -> None:
     """Extract zip or tar archives into extract_path."""
+    import tarfile
+
     archive_buffer = io.BytesIO(archive_bytes)
     if zipfile.is_zipfile(archive_buffer):
         archive_buffer.seek(0)
@@ -179,31 +324,692 @@ def extract_archive(archive_bytes: bytes, extract_path: Path) -> None:
 
     archive_buffer.seek(0)
     try:
-        with tarfile.open(fileobj=archive_buffer, mode="r:*") as tar:
-            try:
-                tar.extractall(extract_path, filter="data")
-            except TypeError:
-                tar.extractall(extract_path)
+        # Single forward pass; extractall would index every member first
+        with tarfile.open(
+            fileobj=archive_buffer, mode="r|*", copybufsize=EXTRACT_BUFFER_SIZE
+        ) as tar:
+            _extract_members(tar, extract_path, None)
     except tarfile.TarError as exc:
         raise SkillUpdError("Unable to extract Clawdhub archive.") from exc
 
 
-def validate_repository_structure(repo_dir: Path) -> dict:
-    """Simple validation that provides useful feedback."""
-    patterns_found = []
-    for pattern in [
-        ".claude/skills",
-        "skills",
-        "skill",
-        ".claude/commands",
-        "commands",
-        "command",
-        ".claude/agents",
-        "agents",
-        "agent",
-    ]:
-        if (repo_dir / pattern).exists():
-            patterns_found.append(pattern)
+def _get_client() -> "httpx.Client":
+    """Return the process-wide HTTP client so connections are reused."""
+    import httpx
+
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            follow_redirects=True,
+            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
+
+def get_cache_dir() -> Path:
+    """Directory for downloaded tarballs ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "agent-skills-upd"
+
+
+def get_tarball_url(host: str, username: str, repo: str) -> str:
+    """Build the main-branch tarball URL, skipping GitHub's codeload redirect."""
+    if host == "github.com":
+        return f"https://codeload.github.com/{username}/{repo}/tar.gz/refs/heads/main"
+    return f"https://{host}/{username}/{repo}/archive/refs/heads/main.tar.gz"
+
+
+def _tarball_cache_path(host: str, username: str, repo: str) -> Path:
+    """Cached tarball location for a repository."""
+    key = _UNSAFE_CACHE_CHARS.sub("_", f"{host}_{username}_{repo}")
+    return get_cache_dir() / f"{key}.tar.gz"
+
+
+def _etag_index_path() -> Path:
+    """JSON index of validators for cached tarballs, keyed by tarball URL."""
+    return get_cache_dir() / "etags.json"
+
+
+def _load_json_index(index_path: Path) -> dict:
+    try:
+        with index_path.open("rb") as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _update_json_index(index_path: Path, key: str, value: object) -> None:
+    """Set one key in a JSON index file, replacing the file atomically."""
+    with _CACHE_INDEX_LOCK:
+        index = _load_json_index(index_path)
+        index[key] = value
+        partial = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            partial.write_text(json.dumps(index, indent=2), encoding="utf-8")
+            os.replace(partial, index_path)
+        except OSError:
+            partial.unlink(missing_ok=True)
+
+
+def _load_etag_index() -> dict:
+    return _load_json_index(_etag_index_path())
+
+
+def _conditional_headers(tarball_url: str, cache_path: Path) -> dict[str, str] | None:
+    """If-None-Match/If-Modified-Since for a cached tarball, if there is one."""
+    entry = _load_etag_index().get(tarball_url)
+    if not isinstance(entry, dict) or entry.get("path") != cache_path.name:
+        return None
+    if not cache_path.exists():
+        return None
+
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers or None
+
+
+def _record_validators(
+    tarball_url: str, cache_path: Path, etag: str | None, last_modified: str | None
+) -> None:
+    """Store the validators of a freshly cached tarball in the index.
+
+    Trees extracted from the tarball it replaced are removed.
+    """
+    _update_json_index(
+        _etag_index_path(),
+        tarball_url,
+        {"etag": etag, "last_modified": last_modified, "path": cache_path.name},
+    )
+    _remove_trees(cache_path)
+
+
+def _installed_index_path() -> Path:
+    """JSON index of the tarball version behind each installed resource."""
+    return get_cache_dir() / "installed.json"
+
+
+def _install_fingerprint(resource_dest: Path) -> str | None:
+    """Digest of the names, sizes and mtimes of an installed resource.
+
+    Changes when the user edits, adds or deletes anything in it; None when
+    the resource is gone.
+    """
+    digest = hashlib.sha256()
+    try:
+        info = os.lstat(resource_dest)
+        digest.update(f"{info.st_mode}:{info.st_size}:{info.st_mtime_ns}".encode())
+        if stat.S_ISDIR(info.st_mode):
+            for root, dirs, files in os.walk(resource_dest):
+                dirs.sort()
+                for entry in sorted(dirs + files):
+                    path = os.path.join(root, entry)
+                    info = os.lstat(path)
+                    relative = os.path.relpath(path, resource_dest)
+                    digest.update(
+                        f"\0{relative}:{info.st_mode}:{info.st_size}:"
+                        f"{info.st_mtime_ns}".encode()
+                    )
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _record_installed(
+    resource_dest: Path, tarball_url: str, etag: str | None = None
+) -> None:
+    """Tag an installed resource with the ETag of the tarball it came from.
+
+    `etag` defaults to the one stored for the cached tarball. The record
+    lives in the cache, keyed by the resource's absolute path.
+    """
+    if etag is None:
+        validators = _load_etag_index().get(tarball_url)
+        etag = validators.get("etag") if isinstance(validators, dict) else None
+    fingerprint = _install_fingerprint(resource_dest)
+    if etag and fingerprint:
+        _update_json_index(
+            _installed_index_path(),
+            str(resource_dest.absolute()),
+            {"source": tarball_url, "etag": etag, "fingerprint": fingerprint},
+        )
+
+
+def _installed_etag(resource_dest: Path, tarball_url: str) -> str | None:
+    """ETag recorded for an installed resource, if it came from this tarball.
+
+    None when the resource was changed or removed since it was installed.
+    """
+    installed = _load_json_index(_installed_index_path()).get(
+        str(resource_dest.absolute())
+    )
+    if not isinstance(installed, dict) or installed.get("source") != tarball_url:
+        return None
+    if installed.get("fingerprint") != _install_fingerprint(resource_dest):
+        return None
+    return installed.get("etag")
+
+
+def _fresh_etag(tarball_url: str) -> str | None:
+    """ETag of a tarball already downloaded or revalidated in this process."""
+    if tarball_url not in _CURRENT_TARBALLS:
+        return None
+    validators = _load_etag_index().get(tarball_url)
+    return validators.get("etag") if isinstance(validators, dict) else None
+
+
+def _head_etag(response: "httpx.Response") -> str | None:
+    return response.headers.get("etag") if response.status_code == 200 else None
+
+
+def _locations_index_path() -> Path:
+    """JSON index of where each repo keeps its file resources."""
+    return get_cache_dir() / "locations.json"
+
+
+def _location_key(host: str, username: str, repo: str) -> str:
+    return f"{host}/{username}/{repo}"
+
+
+def _known_location(
+    host: str, username: str, repo: str, resource_type: ResourceType
+) -> str | None:
+    """Directory a previous fetch found this repo's resources of a type in."""
+    entry = _load_json_index(_locations_index_path()).get(
+        _location_key(host, username, repo)
+    )
+    if not isinstance(entry, dict):
+        return None
+    location = entry.get(resource_type.value)
+    return location if isinstance(location, str) else None
+
+
+def _remember_location(
+    host: str, username: str, repo: str, resource_type: ResourceType, parent: str
+) -> None:
+    index_path = _locations_index_path()
+    key = _location_key(host, username, repo)
+    entry = _load_json_index(index_path).get(key)
+    entry = dict(entry) if isinstance(entry, dict) else {}
+    if entry.get(resource_type.value) != parent:
+        entry[resource_type.value] = parent
+        _update_json_index(index_path, key, entry)
+
+
+def _fetch_raw_file(
+    username: str, repo: str, path: str, resource_dest: Path
+) -> Path | None:
+    """Download one file from raw.githubusercontent.com straight into place.
+
+    Returns None when the file isn't there, the request fails or the
+    destination directory doesn't exist, so the caller can fall back to the
+    repository tarball.
+    """
+    import httpx
+
+    url = f"{RAW_GITHUB_URL}/{username}/{repo}/main/{path}"
+    try:
+        response = _get_client().get(url)
+    except httpx.RequestError:
+        return None
+    if response.status_code != 200:
+        return None
+
+    partial = resource_dest.with_name(f"{resource_dest.name}.part")
+    try:
+        partial.write_bytes(response.content)
+        os.replace(partial, resource_dest)
+    except FileNotFoundError:
+        # No destination directory yet; the tarball path creates it
+        return None
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return resource_dest
+
+
+def _tree_dir(tarball_url: str, cache_path: Path) -> Path | None:
+    """Where the fully extracted cached tarball lives, keyed by its validators."""
+    entry = _load_etag_index().get(tarball_url)
+    if not isinstance(entry, dict) or entry.get("path") != cache_path.name:
+        return None
+    validators = f"{entry.get('etag') or ''}\0{entry.get('last_modified') or ''}"
+    digest = hashlib.sha256(validators.encode()).hexdigest()[:16]
+    stem = cache_path.name.removesuffix(".tar.gz")
+    return get_cache_dir() / "trees" / f"{stem}-{digest}"
+
+
+def _remove_trees(cache_path: Path, keep: Path | None = None) -> None:
+    """Delete the trees extracted from a cached tarball, except `keep`."""
+    stale = re.compile(
+        rf"{re.escape(cache_path.name.removesuffix('.tar.gz'))}-[0-9a-f]{{16}}"
+    )
+    try:
+        trees = list((get_cache_dir() / "trees").iterdir())
+    except OSError:
+        return
+    for tree in trees:
+        if tree != keep and stale.fullmatch(tree.name):
+            shutil.rmtree(tree, ignore_errors=True)
+
+
+def _ensure_tree(tarball_url: str, cache_path: Path) -> Path | None:
+    """Extract the cached tarball once per version and return the tree.
+
+    Returns None when the tree can't be built (e.g. unwritable cache).
+    Trees of older versions of the same repo are removed.
+    """
+    tree_dir = _tree_dir(tarball_url, cache_path)
+    if tree_dir is None:
+        return None
+    if tree_dir.is_dir():
+        return tree_dir
+
+    try:
+        tree_dir.parent.mkdir(parents=True, exist_ok=True)
+        building = Path(
+            tempfile.mkdtemp(prefix=f"{tree_dir.name}.", dir=tree_dir.parent)
+        )
+    except OSError:
+        return None
+
+    try:
+        extract_tarball_file(cache_path, building)
+        os.rename(building, tree_dir)
+    except OSError:
+        # Lost a race with a concurrent fetch that built the same tree
+        shutil.rmtree(building, ignore_errors=True)
+        return tree_dir if tree_dir.is_dir() else None
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+    _remove_trees(cache_path, keep=tree_dir)
+    return tree_dir
+
+
+def _install_from_cached_tarball(
+    tarball_url: str,
+    cache_path: Path,
+    member_filter: "Callable[[tarfile.TarInfo], bool] | None",
+    install: Callable[..., Path],
+) -> Path:
+    """Install from the cached tarball, through the shared tree when possible."""
+    tree_dir = _ensure_tree(tarball_url, cache_path)
+    if tree_dir is not None:
+        return install(tree_dir, move=False)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        extract_path = Path(tmp_dir) / "extracted"
+        extract_tarball_file(cache_path, extract_path, member_filter)
+        return install(extract_path)
+
+
+def _tee_to_cache(
+    chunks: Iterator[bytes],
+    cache_path: Path,
+    tarball_url: str,
+    etag: str | None,
+    last_modified: str | None,
+) -> Iterator[bytes]:
+    """Pass chunks through while saving them; commit the cache only when complete."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique name: concurrent fetches of one repo may write at once
+        fd, partial_name = tempfile.mkstemp(
+            prefix=f"{cache_path.name}.", suffix=".part", dir=cache_path.parent
+        )
+        partial = Path(partial_name)
+        handle = os.fdopen(fd, "wb")
+    except OSError:
+        # Caching is best-effort; an unwritable cache dir must not fail the install
+        yield from chunks
+        return
+
+    try:
+        with handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                yield chunk
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    os.replace(partial, cache_path)
+    _record_validators(tarball_url, cache_path, etag, last_modified)
+    _CURRENT_TARBALLS.add(tarball_url)
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _write_member(path: Path, data: bytes, mode: int, mtime: float) -> None:
+    with open(path, "wb") as handle:
+        handle.write(data)
+    os.chmod(path, mode)
+    os.utime(path, (mtime, mtime))
+
+
+def _extract_members(
+    tar: "tarfile.TarFile",
+    extract_path: Path,
+    wanted: "Callable[[tarfile.TarInfo], bool] | None",
+) -> None:
+    """Extract the members of a stream-mode tar as they are read.
+
+    Path safety is checked by _sanitize_member, so tarfile's own filter is
+    told to trust members (and so it doesn't re-walk them) where it has one.
+    Small regular files are handed to a thread pool, so their open/write/
+    close syscalls overlap with decompressing the rest of the stream.
+    """
+    import tarfile
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    extract_kwargs = (
+        {"filter": "fully_trusted"} if hasattr(tarfile, "fully_trusted_filter") else {}
+    )
+    with ThreadPoolExecutor(max_workers=EXTRACT_WRITE_WORKERS) as pool:
+        pending = []
+
+        def flush() -> None:
+            for future in wait(pending).done:
+                future.result()
+            pending.clear()
+
+        for member in tar:
+            if wanted is not None and not wanted(member):
+                continue
+            if not _sanitize_member(member):
+                continue
+            if member.isreg() and member.size <= POOLED_WRITE_MAX_SIZE:
+                path = extract_path / member.name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                data = tar.extractfile(member).read()
+                pending.append(
+                    pool.submit(_write_member, path, data, member.mode, member.mtime)
+                )
+                if len(pending) >= 8 * EXTRACT_WRITE_WORKERS:
+                    flush()
+                continue
+            if not member.isdir():
+                # Links may point at files still being written
+                flush()
+            tar.extract(member, extract_path, **extract_kwargs)
+        flush()
+
+
+def _is_unsafe_path(path: str) -> bool:
+    return path.startswith(("/", "\\")) or ".." in path.replace("\\", "/").split("/")
+
+
+def _sanitize_member(member: "tarfile.TarInfo") -> bool:
+    """Apply the 'data' filter rules in place; False means skip the member.
+
+    Rejects absolute or parent-relative names and link targets, and special
+    files; drops ownership and the setuid/setgid/sticky and group/other
+    write bits.
+    """
+    if _is_unsafe_path(member.name):
+        return False
+    if member.issym() or member.islnk():
+        if _is_unsafe_path(member.linkname):
+            return False
+    elif member.isreg():
+        mode = member.mode & 0o755
+        if not mode & 0o100:
+            mode &= ~0o111
+        member.mode = mode | 0o600
+    elif member.isdir():
+        member.mode = (member.mode & 0o755) | 0o700
+    else:
+        return False
+
+    # -1 tells chown (only attempted as root) to leave ownership alone
+    member.uid = member.gid = -1
+    member.uname = member.gname = None
+    return True
+
+
+def extract_tarball_stream(
+    chunks: Iterator[bytes],
+    extract_path: Path,
+    wanted: "Callable[[tarfile.TarInfo], bool] | None" = None,
+) -> None:
+    """Extract a gzipped tarball while it is still being downloaded.
+
+    If `wanted` is given, only members it accepts are written to disk;
+    the rest are read past without touching the filesystem.
+    """
+    import tarfile
+
+    stream = io.BufferedReader(_ChunkStream(chunks), buffer_size=DOWNLOAD_CHUNK_SIZE)
+    try:
+        # "r|gz" reads members in one forward pass, no seeking or buffering
+        with tarfile.open(
+            fileobj=stream, mode="r|gz", copybufsize=EXTRACT_BUFFER_SIZE
+        ) as tar:
+            _extract_members(tar, extract_path, wanted)
+        # Drain what tar leaves unread (gzip trailer, padding) so wrapped
+        # iterators such as the cache writer run to completion
+        stream.read()
+    except tarfile.TarError as exc:
+        raise SkillUpdError("Unable to extract repository archive.") from exc
+
+
+def extract_tarball_file(
+    tarball_path: Path,
+    extract_path: Path,
+    wanted: "Callable[[tarfile.TarInfo], bool] | None" = None,
+) -> None:
+    """Extract a gzipped tarball on disk, inflating large ones on all cores.
+
+    With the optional rapidgzip package, archives of PARALLEL_GZIP_THRESHOLD
+    bytes or more are decompressed in parallel; everything else goes through
+    the same single-threaded path as a download.
+    """
+    import tarfile
+
+    if (
+        not RAPIDGZIP_AVAILABLE
+        or tarball_path.stat().st_size < PARALLEL_GZIP_THRESHOLD
+    ):
+        extract_tarball_stream(_iter_file(tarball_path), extract_path, wanted)
+        return
+
+    import rapidgzip
+
+    try:
+        with rapidgzip.open(
+            os.fspath(tarball_path), parallelization=os.cpu_count() or 1
+        ) as gz, tarfile.open(
+            fileobj=gz, mode="r|", copybufsize=EXTRACT_BUFFER_SIZE
+        ) as tar:
+            _extract_members(tar, extract_path, wanted)
+    except tarfile.TarError as exc:
+        raise SkillUpdError("Unable to extract repository archive.") from exc
+
+
+def _reflink_or_copy(src, dst, *, follow_symlinks: bool = True):
+    """copy2 replacement that clones file extents when the filesystem allows."""
+    if sys.platform == "linux":
+        import fcntl
+
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            pass  # not btrfs/xfs, or across filesystems; copy2 rewrites dst
+        else:
+            shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+            return dst
+    elif sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return dst
+    return _kernel_copy(src, dst, follow_symlinks=follow_symlinks)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+        if copied == 0:
+            raise OSError(f"copy_file_range stopped after {offset} of {size} bytes")
+        offset += copied
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            raise OSError(f"sendfile stopped after {offset} of {size} bytes")
+        offset += sent
+
+
+# In-kernel copies, best first: copy_file_range can share extents or copy
+# server-side (NFS, SMB); sendfile at least skips user space
+_KERNEL_COPIES = tuple(
+    copy
+    for copy, syscall in (
+        (_copy_file_range, "copy_file_range"),
+        (_sendfile, "sendfile"),
+    )
+    if hasattr(os, syscall)
+)
+
+
+def _kernel_copy(src, dst, *, follow_symlinks: bool = True):
+    """copy2 that moves the bytes in-kernel when the platform allows."""
+    if not follow_symlinks and os.path.islink(src):
+        return shutil.copy2(src, dst, follow_symlinks=False)
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        size = os.fstat(src_file.fileno()).st_size
+        for kernel_copy in _KERNEL_COPIES:
+            try:
+                kernel_copy(src_file.fileno(), dst_file.fileno(), size)
+                break
+            except OSError:
+                # Not supported for this pair of files, or it stopped short
+                # (e.g. 0 for a cross-device copy); start over
+                dst_file.seek(0)
+                dst_file.truncate()
+        else:
+            shutil.copyfileobj(src_file, dst_file, length=COPY_BUFFER_SIZE)
+    shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+    return dst
+
+
+def _fast_copy(src: Path, dst: Path, move: bool = True) -> None:
+    """Put src at dst, renaming when `move` allows. src may be moved away."""
+    if move:
+        try:
+            # Same filesystem (typical for the temp dir): O(1) regardless of size
+            os.rename(src, dst)
+            return
+        except FileNotFoundError:
+            # src is gone or dst's directory doesn't exist; copying can't help
+            raise
+        except OSError:
+            pass
+
+    if src.is_dir():
+        shutil.copytree(src, dst, copy_function=_reflink_or_copy)
+    else:
+        _reflink_or_copy(src, dst)
+
+
+def _place(src: Path, dst: Path, move: bool = True) -> None:
+    """_fast_copy, creating dst's directory only if it turns out to be missing.
+
+    The CLI creates destination directories up front, so the usual case
+    costs no mkdir at all.
+    """
+    try:
+        _fast_copy(src, dst, move=move)
+    except FileNotFoundError:
+        if dst.parent.is_dir():
+            raise
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        _fast_copy(src, dst, move=move)
+
+
+def _scandir_names(path: Path) -> set[str]:
+    """Names of the entries in a directory (one syscall batch), empty if missing."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+# Directories that identify a known agent-resources layout
+STRUCTURE_PATTERNS = (
+    ".claude/skills",
+    "skills",
+    "skill",
+    ".claude/commands",
+    "commands",
+    "command",
+    ".claude/agents",
+    "agents",
+    "agent",
+)
+
+
+def _listing(listings: dict[str, set[str]], repo_dir: Path, parent: str) -> set[str]:
+    entries = listings.get(parent)
+    if entries is None:
+        entries = listings[parent] = _scandir_names(
+            repo_dir / parent if parent else repo_dir
+        )
+    return entries
+
+
+def validate_repository_structure(
+    repo_dir: Path, listings: dict[str, set[str]] | None = None
+) -> dict:
+    """Simple validation that provides useful feedback.
+
+    `listings` takes the directory listings find_resource_in_repo already
+    read, so the not-found path doesn't scan the same directories twice.
+    """
+    listings = {} if listings is None else listings
+    present = set(_listing(listings, repo_dir, ""))
+    if ".claude" in present:
+        present |= {
+            f".claude/{name}" for name in _listing(listings, repo_dir, ".claude")
+        }
+    patterns_found = [pattern for pattern in STRUCTURE_PATTERNS if pattern in present]
 
     suggestions = []
     if not patterns_found:
@@ -213,22 +1019,426 @@ def validate_repository_structure(repo_dir: Path) -> dict:
     return {"patterns_found": patterns_found, "suggestions": suggestions}
 
 
+def _search_locations(
+    patterns: list[str], extension: str | None
+) -> tuple[tuple[str | None, str, str], ...]:
+    """Split patterns into (top-level dir, parent dir, leaf suffix) once.
+
+    {name} is always the last path component, so a candidate is
+    `parent/<name><suffix>`; top is the parent's first component, or None
+    for patterns that live in the repo root.
+    """
+    locations = []
+    for pattern in patterns:
+        head, _, tail = pattern.partition("{name}")
+        parent = head.rstrip("/")
+        suffix = tail.rstrip("/")
+        if extension and not suffix.endswith(extension):
+            suffix += extension
+        top = parent.split("/", 1)[0] if parent else None
+        locations.append((top, parent, suffix))
+    return tuple(locations)
+
+
+_SEARCH_LOCATIONS: dict[ResourceType, tuple[tuple[str | None, str, str], ...]] = {
+    resource_type: _search_locations(
+        patterns, RESOURCE_CONFIGS[resource_type].file_extension
+    )
+    for resource_type, patterns in RESOURCE_SEARCH_PATTERNS.items()
+}
+
+
+# Directories the index lists below the repo root, in a fixed order
+_SEARCH_PARENTS = tuple(
+    sorted(
+        {
+            parent
+            for locations in _SEARCH_LOCATIONS.values()
+            for _, parent, _ in locations
+            if parent
+        }
+    )
+)
+
+
+def resource_search_paths(resource_type: ResourceType, name: str) -> list[str]:
+    """Repo-relative paths where a resource called `name` may live, in order."""
+    return [
+        f"{parent}/{name}{suffix}" if parent else f"{name}{suffix}"
+        for _, parent, suffix in _SEARCH_LOCATIONS[resource_type]
+    ]
+
+
+def resource_member_filter(
+    repo_root: str, resource_type: ResourceType, name: str
+) -> "Callable[[tarfile.TarInfo], bool]":
+    """Tar member predicate keeping only what finding `name` can use.
+
+    Members under one of the search paths are kept, plus the bare
+    STRUCTURE_PATTERNS directories so that validate_repository_structure
+    still sees the repository layout when the resource is missing.
+    """
+    exact = frozenset(
+        f"{repo_root}/{path.rstrip('/')}"
+        for path in resource_search_paths(resource_type, name)
+    )
+    prefixes = tuple(f"{path}/" for path in exact)
+    layout = frozenset(f"{repo_root}/{pattern}" for pattern in STRUCTURE_PATTERNS)
+
+    def wanted(member: "tarfile.TarInfo") -> bool:
+        name = member.name
+        return name in exact or name in layout or name.startswith(prefixes)
+
+    return wanted
+
+
+def _index_repo(
+    repo_dir: Path,
+) -> tuple[dict[tuple[ResourceType, str], Path], dict[str, set[str]]]:
+    """Every resource a repo offers, from one read of each search location.
+
+    Returns ({(resource_type, name): path}, listings). The first matching
+    pattern wins, as in RESOURCE_SEARCH_PATTERNS. Results are cached per
+    directory identity, so probing one extracted tree for several resource
+    types reads it once. The identity includes the mtime of every search
+    directory, since entries added inside them leave the root's unchanged.
+    """
+    try:
+        info = os.stat(repo_dir)
+    except OSError:
+        return {}, {"": set()}
+    identity = [info.st_dev, info.st_ino, info.st_mtime_ns]
+    for parent in _SEARCH_PARENTS:
+        try:
+            identity.append(os.stat(repo_dir / parent).st_mtime_ns)
+        except OSError:
+            identity.append(-1)
+    return _index_repo_cached(repo_dir, *identity)
+
+
+@lru_cache(maxsize=8)
+def _index_repo_cached(
+    repo_dir: Path, *identity: int
+) -> tuple[dict[tuple[ResourceType, str], Path], dict[str, set[str]]]:
+    # Patterns whose first component isn't in the repo root can't match
+    listings: dict[str, set[str]] = {}
+    root = _listing(listings, repo_dir, "")
+    resources: dict[tuple[ResourceType, str], Path] = {}
+
+    for resource_type, locations in _SEARCH_LOCATIONS.items():
+        for top, parent, suffix in locations:
+            if top is not None and top not in root:
+                continue
+            for entry in _listing(listings, repo_dir, parent):
+                if not entry.endswith(suffix) or len(entry) == len(suffix):
+                    continue
+                name = entry[: len(entry) - len(suffix)]
+                resources.setdefault((resource_type, name), repo_dir / parent / entry)
+
+    return resources, listings
+
+
 def find_resource_in_repo(
-    repo_dir: Path, resource_type: ResourceType, name: str
+    repo_dir: Path,
+    resource_type: ResourceType,
+    name: str,
+    listings: dict[str, set[str]] | None = None,
 ) -> Path | None:
-    """Simple pattern-based search - no caching, no complexity."""
+    """Pattern-based search, answered from the repo's cached index.
+
+    Directory listings read for the lookup are copied into `listings`,
+    when given, keyed by repo-relative path ("" for the repo root).
+    """
+    resources, repo_listings = _index_repo(repo_dir)
+    if listings is not None:
+        listings.update(repo_listings)
+    return resources.get((resource_type, name))
+
+
+def _check_and_get_dest(
+    dest: Path, resource_type: ResourceType, name: str, overwrite: bool
+) -> Path:
+    """Where `name` gets installed; refuses an existing one unless overwriting.
+
+    Called once per fetch, as soon as the name is known.
+    """
     config = RESOURCE_CONFIGS[resource_type]
+    if config.is_directory:
+        resource_dest = dest / name
+    else:
+        resource_dest = dest / f"{name}{config.file_extension}"
 
-    for pattern in RESOURCE_SEARCH_PATTERNS[resource_type]:
-        search_path = pattern.format(name=name)
-        if config.file_extension and not search_path.endswith(config.file_extension):
-            search_path += config.file_extension
+    if not overwrite:
+        try:
+            resource_dest.lstat()
+        except FileNotFoundError:
+            pass
+        else:
+            raise ResourceExistsError(
+                f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
+                f"Use --overwrite to replace it."
+            )
+    return resource_dest
 
-        resource_path = repo_dir / search_path
-        if resource_path.exists():
-            return resource_path
 
-    return None
+def _iter_file(path: Path) -> Iterator[bytes]:
+    """Read a file in download-sized chunks."""
+    with path.open("rb") as handle:
+        yield from iter(lambda: handle.read(DOWNLOAD_CHUNK_SIZE), b"")
+
+
+def _tarball_chunks(
+    response: "httpx.Response",
+    read_body: Callable[[], Iterator[bytes]],
+    tarball_url: str,
+    cache_path: Path,
+    username: str,
+    repo: str,
+    host: str,
+) -> Iterator[bytes] | None:
+    """Check a tarball response and pick where its bytes come from.
+
+    Returns None on a 304, meaning the cached tarball is current. A fresh
+    body is saved to the cache as it is read when the server sent an ETag
+    or Last-Modified to revalidate it with later; otherwise the superseded
+    cached tarball and its trees are dropped.
+    """
+    if response.status_code == 404:
+        raise RepoNotFoundError(
+            f"Repository '{username}/{repo}' not found on {host}."
+        )
+    if response.status_code == 304:
+        # Unchanged since the cached download; skip the body entirely
+        return None
+
+    response.raise_for_status()
+    chunks = read_body()
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag or last_modified:
+        return _tee_to_cache(chunks, cache_path, tarball_url, etag, last_modified)
+    try:
+        cache_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    _remove_trees(cache_path)
+    return chunks
+
+
+def _install_resource(
+    extract_path: Path,
+    username: str,
+    name: str | None,
+    dest: Path,
+    resource_dest: Path | None,
+    resource_type: ResourceType,
+    overwrite: bool,
+    host: str,
+    repo: str,
+    move: bool = True,
+) -> Path:
+    """Find the resource in an extracted tarball and put it in place.
+
+    With move=False the extracted tree is shared and is copied from, never
+    renamed away.
+    """
+    # Find the resource in extracted content using pattern-based search
+    # Tarball extracts to: <repo>-main/<patterns>
+    repo_dir = extract_path / f"{repo}-main"
+    config = RESOURCE_CONFIGS[resource_type]
+    listings: dict[str, set[str]] = {}
+
+    resource_source = (
+        find_resource_in_repo(repo_dir, resource_type, name, listings)
+        if name
+        else None
+    )
+    if resource_source is not None and not config.is_directory:
+        _remember_location(
+            host,
+            username,
+            repo,
+            resource_type,
+            resource_source.parent.relative_to(repo_dir).as_posix(),
+        )
+    root_skill_message = None
+    root_skill_name = None
+    if (
+        resource_source is None
+        and resource_type == ResourceType.SKILL
+        and repo != REPO_NAME
+    ):
+        root_skill_file = find_root_skill_file(repo_dir)
+        if root_skill_file is None:
+            root_skill_message = (
+                "Root SKILL.md not found (case-insensitive) in repo root."
+            )
+        else:
+            root_skill_name, root_skill_error = parse_frontmatter_name(
+                root_skill_file
+            )
+            if root_skill_error:
+                root_skill_message = root_skill_error
+            else:
+                if name is None:
+                    name = root_skill_name
+                    resource_source = root_skill_file.parent
+                elif root_skill_name != name:
+                    root_skill_message = (
+                        "Root SKILL.md frontmatter name "
+                        f"'{root_skill_name}' does not match requested '{name}'."
+                    )
+                else:
+                    resource_source = root_skill_file.parent
+
+    if resource_source is None or not resource_source.exists():
+        display_name = name or "<unspecified>"
+        patterns_name = name or "<skill-name>"
+        patterns_tried = [
+            p.replace("{name}", patterns_name)
+            for p in RESOURCE_SEARCH_PATTERNS[resource_type]
+        ]
+        patterns_list = "\n".join([f"- {pattern}" for pattern in patterns_tried])
+
+        validation = validate_repository_structure(repo_dir, listings)
+
+        error_msg = (
+            f"{resource_type.value.capitalize()} '{display_name}' not found in {username}/{repo}.\n"
+            f"Tried these locations:\n{patterns_list}\n"
+        )
+
+        if validation["suggestions"]:
+            error_msg += "\nRepository structure issues:\n"
+            error_msg += "\n".join([f"- {msg}" for msg in validation["suggestions"]])
+            error_msg += "\n"
+        elif validation["patterns_found"]:
+            error_msg += (
+                f"\nFound directories: {', '.join(validation['patterns_found'])}\n"
+            )
+
+        if root_skill_message:
+            error_msg += "\nManual repo override check:\n"
+            error_msg += f"- {root_skill_message}\n"
+
+        error_msg += (
+            "\nQuick fixes:\n"
+            "- Double-check the resource name\n"
+            "- Try --repo REPO_NAME if using a different repository\n"
+            "- Try --dest PATH for custom installation location\n"
+            f"- Visit https://{host}/{username}/{repo} to verify the resource exists"
+        )
+
+        raise ResourceNotFoundError(error_msg)
+
+    if resource_dest is None:
+        if name is None:
+            raise SkillUpdError("Skill name could not be determined.")
+        resource_dest = _check_and_get_dest(dest, resource_type, name, overwrite)
+
+    # Remove existing if overwriting; a missing one needs no stat first
+    if config.is_directory:
+        try:
+            shutil.rmtree(resource_dest)
+        except FileNotFoundError:
+            pass
+    else:
+        resource_dest.unlink(missing_ok=True)
+
+    # Move resource into place; the temp dir is discarded afterwards
+    _place(resource_source, resource_dest, move=move)
+
+    return resource_dest
+
+
+@dataclass
+class _FetchPlan:
+    """What fetch_resource and fetch_resource_async work out before downloading."""
+
+    username: str
+    name: str | None
+    dest: Path
+    resource_type: ResourceType
+    overwrite: bool
+    host: str
+    repo: str
+    resource_dest: Path | None
+    tarball_url: str
+    cache_path: Path
+    headers: dict[str, str] | None
+    member_filter: "Callable[[tarfile.TarInfo], bool] | None"
+    installed_etag: str | None
+
+    def install(self, extract_path: Path, move: bool = True) -> Path:
+        installed = _install_resource(
+            extract_path,
+            self.username,
+            self.name,
+            self.dest,
+            self.resource_dest,
+            self.resource_type,
+            self.overwrite,
+            self.host,
+            self.repo,
+            move=move,
+        )
+        _record_installed(installed, self.tarball_url)
+        return installed
+
+    def install_cached(self) -> Path:
+        """Install from the cached tarball, known to be current."""
+        _CURRENT_TARBALLS.add(self.tarball_url)
+        return _install_from_cached_tarball(
+            self.tarball_url, self.cache_path, self.member_filter, self.install
+        )
+
+    def cache_is_current(self) -> bool:
+        """Whether this process already downloaded or revalidated the tarball."""
+        return self.tarball_url in _CURRENT_TARBALLS and self.cache_path.exists()
+
+
+def _plan_fetch(
+    username: str,
+    name: str | None,
+    dest: Path,
+    resource_type: ResourceType,
+    overwrite: bool,
+    host: str,
+    repo: str,
+) -> _FetchPlan:
+    """Check the destination and gather the cache state for one fetch."""
+    resource_dest = None
+    if name is not None:
+        resource_dest = _check_and_get_dest(dest, resource_type, name, overwrite)
+
+    # Download tarball, revalidating any cached copy by ETag or Last-Modified
+    tarball_url = get_tarball_url(host, username, repo)
+    cache_path = _tarball_cache_path(host, username, repo)
+
+    # Only unpack the candidate locations. A manual repo may fall back to a
+    # root SKILL.md, which installs the whole repo, so that needs everything.
+    member_filter = None
+    if name is not None and not (
+        resource_type == ResourceType.SKILL and repo != REPO_NAME
+    ):
+        member_filter = resource_member_filter(f"{repo}-main", resource_type, name)
+
+    return _FetchPlan(
+        username=username,
+        name=name,
+        dest=dest,
+        resource_type=resource_type,
+        overwrite=overwrite,
+        host=host,
+        repo=repo,
+        resource_dest=resource_dest,
+        tarball_url=tarball_url,
+        cache_path=cache_path,
+        headers=_conditional_headers(tarball_url, cache_path),
+        member_filter=member_filter,
+        installed_etag=(
+            _installed_etag(resource_dest, tarball_url) if resource_dest else None
+        ),
+    )
 
 
 def fetch_resource(
@@ -259,161 +1469,265 @@ def fetch_resource(
         ResourceNotFoundError: If the resource doesn't exist in the repo
         ResourceExistsError: If resource exists locally and overwrite=False
     """
-    config = RESOURCE_CONFIGS[resource_type]
+    import httpx
 
-    resource_dest = None
-    if name is not None:
-        # Determine destination path
-        if config.is_directory:
-            resource_dest = dest / name
-        else:
-            resource_dest = dest / f"{name}{config.file_extension}"
+    plan = _plan_fetch(username, name, dest, resource_type, overwrite, host, repo)
+    tarball_url = plan.tarball_url
+    resource_dest = plan.resource_dest
 
-        # Check if resource already exists locally
-        if resource_dest.exists() and not overwrite:
-            raise ResourceExistsError(
-                f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
-                f"Use --overwrite to replace it."
-            )
-
-    # Download tarball
-    tarball_url = f"https://{host}/{username}/{repo}/archive/refs/heads/main.tar.gz"
+    # Re-running an update against an unchanged repo downloads nothing
+    etag = None
+    if plan.installed_etag is not None:
+        etag = _fresh_etag(tarball_url)
+        if etag is None:
+            try:
+                etag = _head_etag(_get_client().head(tarball_url))
+            except httpx.RequestError:
+                pass
+        if etag == plan.installed_etag:
+            return resource_dest
+
+    if plan.cache_is_current():
+        return plan.install_cached()
+
+    # A single file from a GitHub repo known to keep this resource type in
+    # its first search location, where no other candidate could win
+    if resource_dest is not None and host == "github.com":
+        location = _known_location(host, username, repo, resource_type)
+        _, primary, _ = _SEARCH_LOCATIONS[resource_type][0]
+        if location is not None and location == primary:
+            path = posixpath.join(location, resource_dest.name)
+            fetched = _fetch_raw_file(username, repo, path, resource_dest)
+            if fetched is not None:
+                # Only the HEAD's ETag describes the file just fetched
+                if etag is not None:
+                    _record_installed(fetched, tarball_url, etag)
+                return fetched
 
     with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        tarball_path = tmp_path / "repo.tar.gz"
+        extract_path = Path(tmp_dir) / "extracted"
 
-        # Download
+        # Download and extract in one pass, without holding the tarball
         try:
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-                response = client.get(tarball_url)
-                if response.status_code == 404:
-                    raise RepoNotFoundError(
-                        f"Repository '{username}/{repo}' not found on {host}."
-                    )
-                response.raise_for_status()
-
-                tarball_path.write_bytes(response.content)
+            with _get_client().stream(
+                "GET", tarball_url, headers=plan.headers
+            ) as response:
+                chunks = _tarball_chunks(
+                    response,
+                    lambda: response.iter_bytes(DOWNLOAD_CHUNK_SIZE),
+                    tarball_url,
+                    plan.cache_path,
+                    username,
+                    repo,
+                    host,
+                )
+                if chunks is not None:
+                    extract_tarball_stream(chunks, extract_path, plan.member_filter)
         except httpx.HTTPStatusError as e:
             raise SkillUpdError(f"Failed to download repository: {e}")
         except httpx.RequestError as e:
             raise SkillUpdError(f"Network error: {e}")
 
-        # Extract
-        extract_path = tmp_path / "extracted"
-        with tarfile.open(tarball_path, "r:gz") as tar:
-            try:
-                tar.extractall(extract_path, filter="data")
-            except TypeError:
-                tar.extractall(extract_path)
+        if chunks is None:
+            return plan.install_cached()
+        return plan.install(extract_path)
 
-        # Find the resource in extracted content using pattern-based search
-        # Tarball extracts to: <repo>-main/<patterns>
-        repo_dir = extract_path / f"{repo}-main"
 
-        resource_source = (
-            find_resource_in_repo(repo_dir, resource_type, name) if name else None
-        )
-        root_skill_message = None
-        root_skill_name = None
-        if (
-            resource_source is None
-            and resource_type == ResourceType.SKILL
-            and repo != REPO_NAME
-        ):
-            root_skill_file = find_root_skill_file(repo_dir)
-            if root_skill_file is None:
-                root_skill_message = (
-                    "Root SKILL.md not found (case-insensitive) in repo root."
-                )
+class _AsyncChunkBridge:
+    """Hands chunks from the event loop to a worker thread, with backpressure.
+
+    The event loop awaits put()/close(); the worker iterates the bridge.
+    The worker must drain() before it exits so a blocked put() can finish.
+    """
+
+    _END = object()
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._finished = False
+
+    async def put(self, chunk: bytes) -> None:
+        await self._queue.put(chunk)
+
+    async def close(self, error: BaseException | None = None) -> None:
+        await self._queue.put(self._END if error is None else error)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while not self._finished:
+            item = asyncio.run_coroutine_threadsafe(
+                self._queue.get(), self._loop
+            ).result()
+            if item is self._END:
+                self._finished = True
+            elif isinstance(item, BaseException):
+                self._finished = True
+                raise item
             else:
-                root_skill_name, root_skill_error = parse_frontmatter_name(
-                    root_skill_file
-                )
-                if root_skill_error:
-                    root_skill_message = root_skill_error
-                else:
-                    if name is None:
-                        name = root_skill_name
-                        resource_source = root_skill_file.parent
-                    elif root_skill_name != name:
-                        root_skill_message = (
-                            "Root SKILL.md frontmatter name "
-                            f"'{root_skill_name}' does not match requested '{name}'."
-                        )
-                    else:
-                        resource_source = root_skill_file.parent
-
-        if resource_source is None or not resource_source.exists():
-            display_name = name or "<unspecified>"
-            patterns_name = name or "<skill-name>"
-            patterns_tried = [
-                p.format(name=patterns_name)
-                for p in RESOURCE_SEARCH_PATTERNS[resource_type]
-            ]
-            patterns_list = "\n".join([f"- {pattern}" for pattern in patterns_tried])
-
-            validation = validate_repository_structure(repo_dir)
-
-            error_msg = (
-                f"{resource_type.value.capitalize()} '{display_name}' not found in {username}/{repo}.\n"
-                f"Tried these locations:\n{patterns_list}\n"
-            )
+                yield item
 
-            if validation["suggestions"]:
-                error_msg += "\nRepository structure issues:\n"
-                error_msg += "\n".join([f"- {msg}" for msg in validation["suggestions"]])
-                error_msg += "\n"
-            elif validation["patterns_found"]:
-                error_msg += (
-                    f"\nFound directories: {', '.join(validation['patterns_found'])}\n"
-                )
+    def drain(self) -> None:
+        try:
+            for _ in self:
+                pass
+        except BaseException:
+            pass
 
-            if root_skill_message:
-                error_msg += "\nManual repo override check:\n"
-                error_msg += f"- {root_skill_message}\n"
 
-            error_msg += (
-                "\nQuick fixes:\n"
-                "- Double-check the resource name\n"
-                "- Try --repo REPO_NAME if using a different repository\n"
-                "- Try --dest PATH for custom installation location\n"
-                f"- Visit https://{host}/{username}/{repo} to verify the resource exists"
-            )
+async def fetch_resource_async(
+    client: "httpx.AsyncClient",
+    username: str,
+    name: str | None,
+    dest: Path,
+    resource_type: ResourceType,
+    overwrite: bool = True,
+    host: str = "github.com",
+    repo: str = REPO_NAME,
+) -> Path:
+    """
+    Async fetch_resource that shares `client` with other downloads.
 
-            raise ResourceNotFoundError(error_msg)
+    The body is streamed on the event loop and extracted in a worker thread
+    as it arrives, so several fetches overlap both network and tar work.
+    File system work runs in worker threads too.
+    """
+    import httpx
 
-        if resource_dest is None:
-            if name is None:
-                raise SkillUpdError("Skill name could not be determined.")
-            if config.is_directory:
-                resource_dest = dest / name
-            else:
-                resource_dest = dest / f"{name}{config.file_extension}"
+    plan = await asyncio.to_thread(
+        _plan_fetch, username, name, dest, resource_type, overwrite, host, repo
+    )
+    tarball_url = plan.tarball_url
 
-            if resource_dest.exists() and not overwrite:
-                raise ResourceExistsError(
-                    f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
-                    f"Use --overwrite to replace it."
-                )
+    if plan.installed_etag is not None:
+        etag = await asyncio.to_thread(_fresh_etag, tarball_url)
+        if etag is None:
+            try:
+                etag = _head_etag(await client.head(tarball_url))
+            except httpx.RequestError:
+                pass
+        if etag == plan.installed_etag:
+            return plan.resource_dest
 
-        # Remove existing if overwriting
-        if resource_dest.exists():
-            if config.is_directory:
-                shutil.rmtree(resource_dest)
-            else:
-                resource_dest.unlink()
+    if await asyncio.to_thread(plan.cache_is_current):
+        return await asyncio.to_thread(plan.install_cached)
+
+    bridge = _AsyncChunkBridge(asyncio.get_running_loop(), ASYNC_QUEUE_CHUNKS)
+
+    def extract_and_install(chunks: Iterator[bytes]) -> Path:
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                extract_path = Path(tmp_dir) / "extracted"
+                extract_tarball_stream(chunks, extract_path, plan.member_filter)
+                return plan.install(extract_path)
+        finally:
+            bridge.drain()
 
-        # Ensure destination parent exists
-        dest.mkdir(parents=True, exist_ok=True)
+    try:
+        async with client.stream(
+            "GET", tarball_url, headers=plan.headers
+        ) as response:
+            # Dropping or creating cache files is blocking file system work
+            chunks = await asyncio.to_thread(
+                _tarball_chunks,
+                response,
+                lambda: iter(bridge),
+                tarball_url,
+                plan.cache_path,
+                username,
+                repo,
+                host,
+            )
+            if chunks is None:
+                return await asyncio.to_thread(plan.install_cached)
+
+            worker = asyncio.ensure_future(
+                asyncio.to_thread(extract_and_install, chunks)
+            )
+            try:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await bridge.put(chunk)
+            except BaseException as exc:
+                await bridge.close(exc)
+                await asyncio.gather(worker, return_exceptions=True)
+                raise
+            await bridge.close()
+            return await worker
+    except httpx.HTTPStatusError as e:
+        raise SkillUpdError(f"Failed to download repository: {e}")
+    except httpx.RequestError as e:
+        raise SkillUpdError(f"Network error: {e}")
+
+
+def _job_source(job: dict) -> tuple[str, str, str]:
+    return (
+        job.get("host", "github.com"),
+        job["username"],
+        job.get("repo", REPO_NAME),
+    )
 
-        # Copy resource to destination
-        if config.is_directory:
-            shutil.copytree(str(resource_source), str(resource_dest))
+
+def _job_target(job: dict) -> tuple:
+    """Where a fetch_many job installs to, as far as it's known up front."""
+    name = job.get("name")
+    if name is None:
+        # A root skill's name comes from the repo, so only its source is known
+        return (Path(job["dest"]).absolute(), _job_source(job))
+    config = RESOURCE_CONFIGS[job["resource_type"]]
+    return (Path(job["dest"]).absolute() / f"{name}{config.file_extension or ''}",)
+
+
+async def _fetch_many(jobs: list[dict]) -> list[Path | SkillUpdError]:
+    import httpx
+
+    # Concurrent jobs for one destination would race on it: a repeated job
+    # shares the first one's result, a different source for it is refused
+    first_for_target: dict[tuple, int] = {}
+    unique: list[int] = []
+    for index, job in enumerate(jobs):
+        first = first_for_target.setdefault(_job_target(job), index)
+        if first == index:
+            unique.append(index)
+
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=30.0, http2=HTTP2_AVAILABLE
+    ) as client:
+        fetched = await asyncio.gather(
+            *(fetch_resource_async(client, **jobs[index]) for index in unique),
+            return_exceptions=True,
+        )
+
+    for result in fetched:
+        if isinstance(result, BaseException) and not isinstance(result, SkillUpdError):
+            raise result
+
+    results_by_index = dict(zip(unique, fetched))
+    results: list[Path | SkillUpdError] = []
+    for job in jobs:
+        first = first_for_target[_job_target(job)]
+        if _job_source(job) == _job_source(jobs[first]):
+            results.append(results_by_index[first])
         else:
-            shutil.copy2(str(resource_source), str(resource_dest))
+            host, username, repo = _job_source(jobs[first])
+            results.append(
+                ResourceExistsError(
+                    f"{job['resource_type'].value.capitalize()} '{job['name']}' "
+                    f"is already being installed from {username}/{repo} on {host}."
+                )
+            )
+    return results
 
-    return resource_dest
+
+def fetch_many(jobs: list[dict]) -> list[Path | SkillUpdError]:
+    """
+    Fetch several resources concurrently over one connection pool.
+
+    Each job is a dict of fetch_resource keyword arguments. Results are in
+    job order; a job that fails yields its SkillUpdError instead of a path.
+    Jobs repeating an earlier one are fetched once; a job installing to the
+    same place as an earlier one from another source gets a
+    ResourceExistsError.
+    """
+    return asyncio.run(_fetch_many(jobs))
 
 
 def fetch_clawdhub_skill(
@@ -432,6 +1746,8 @@ def fetch_clawdhub_skill(
     Returns:
         ClawdhubFetchResult with install path and version info.
     """
+    import httpx
+
     resource_dest = dest / name
     was_existing = resource_dest.exists()
     old_version = read_clawdhub_version(resource_dest) if was_existing else None
@@ -443,33 +1759,33 @@ def fetch_clawdhub_skill(
         )
 
     try:
-        with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-            metadata_response = client.get(CLAWDHUB_METADATA_URL, params={"slug": name})
-            if metadata_response.status_code == 404:
-                raise ResourceNotFoundError(
-                    f"Skill '{name}' not found on {CLAWDHUB_HOST}."
-                )
-            metadata_response.raise_for_status()
-            try:
-                metadata = metadata_response.json()
-            except ValueError as exc:
-                raise SkillUpdError("Clawdhub metadata response was not valid JSON.") from exc
-
-            new_version = parse_clawdhub_version(metadata)
-            if not new_version:
-                raise SkillUpdError(
-                    "Clawdhub metadata missing latestVersion.version."
-                )
+        client = _get_client()
+        metadata_response = client.get(CLAWDHUB_METADATA_URL, params={"slug": name})
+        if metadata_response.status_code == 404:
+            raise ResourceNotFoundError(
+                f"Skill '{name}' not found on {CLAWDHUB_HOST}."
+            )
+        metadata_response.raise_for_status()
+        try:
+            metadata = metadata_response.json()
+        except ValueError as exc:
+            raise SkillUpdError("Clawdhub metadata response was not valid JSON.") from exc
 
-            download_response = client.get(
-                CLAWDHUB_DOWNLOAD_URL, params={"slug": name, "tag": "latest"}
+        new_version = parse_clawdhub_version(metadata)
+        if not new_version:
+            raise SkillUpdError(
+                "Clawdhub metadata missing latestVersion.version."
             )
-            if download_response.status_code == 404:
-                raise ResourceNotFoundError(
-                    f"Skill '{name}' not found on {CLAWDHUB_HOST}."
-                )
-            download_response.raise_for_status()
-            archive_bytes = download_response.content
+
+        download_response = client.get(
+            CLAWDHUB_DOWNLOAD_URL, params={"slug": name, "tag": "latest"}
+        )
+        if download_response.status_code == 404:
+            raise ResourceNotFoundError(
+                f"Skill '{name}' not found on {CLAWDHUB_HOST}."
+            )
+        download_response.raise_for_status()
+        archive_bytes = download_response.content
     except httpx.HTTPStatusError as exc:
         raise SkillUpdError(f"Failed to download Clawdhub skill: {exc}") from exc
     except httpx.RequestError as exc:
@@ -495,14 +1811,18 @@ def fetch_clawdhub_skill(
                 f"'{root_skill_name}' does not match requested '{name}'."
             )
 
-        if resource_dest.exists():
-            if resource_dest.is_dir():
+        # One lstat decides how to remove the old install, if there is one
+        try:
+            existing_mode = resource_dest.lstat().st_mode
+        except FileNotFoundError:
+            existing_mode = None
+        if existing_mode is not None:
+            if stat.S_ISDIR(existing_mode):
                 shutil.rmtree(resource_dest)
             else:
                 resource_dest.unlink()
 
-        dest.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(str(archive_root), str(resource_dest))
+        _place(archive_root, resource_dest)
         write_clawdhub_metadata(resource_dest, metadata)
 
     return ClawdhubFetchResult(
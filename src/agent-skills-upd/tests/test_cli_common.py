@@ -0,0 +1,49 @@
+"""Tests for shared CLI helpers."""
+
+import pytest
+import typer
+
+from agent_skills_upd.cli.common import parse_resource_ref
+
+
+@pytest.mark.parametrize(
+    "ref,expected",
+    [
+        ("user/name", ("github.com", "user", "name")),
+        (" user/name.git/ ", ("github.com", "user", "name")),
+        ("my.user/name", ("github.com", "my.user", "name")),
+        ("upd.dev/clawdhub/weather", ("upd.dev", "clawdhub", "weather")),
+        ("https://github.com/user/name.git", ("github.com", "user", "name")),
+        ("http://gitlab.com//user//name/", ("gitlab.com", "user", "name")),
+        ("https://h/u/n?x=1", ("h", "u", "n")),
+        ("https://h/u/n#frag", ("h", "u", "n")),
+        ("https://github.com/a.b/user/name", ("a.b", "user", "name")),
+        ("git@github.com:user/name", ("github.com", "git@github.com:user", "name")),
+        ("us:er/name", ("github.com", "us:er", "name")),
+        ("https://\thost/user/name", ("host", "user", "name")),
+        ("https://ho\nst/user/na\rme", ("host", "user", "name")),
+    ],
+)
+def test_parse_resource_ref(ref, expected):
+    """Short refs, host-prefixed refs and URLs all parse to (host, user, name)."""
+    assert parse_resource_ref(ref) == expected
+
+
+@pytest.mark.parametrize(
+    "ref,message",
+    [
+        ("   ", "cannot be empty"),
+        ("user", "<host>/<username>/<name>"),
+        ("a/b/c", "<host>/<username>/<name>"),
+        ("user/.git", "<host>/<username>/<name>"),
+        ("https://host", "<host>/<username>/<name>"),
+        ("https://gitlab.com/a.b/user/name", "<host>/<username>/<name>"),
+        ("https:///user/name", "or URL."),
+        ("a://\t#\t-github.com", "or URL."),
+        ("https://[::1/user/name", "or URL."),
+    ],
+)
+def test_parse_resource_ref_invalid(ref, message):
+    """Malformed refs raise BadParameter with the usual messages."""
+    with pytest.raises(typer.BadParameter, match=message.replace(".", r"\.")):
+        parse_resource_ref(ref)
@@ -4,9 +4,11 @@ from contextlib import nullcontext
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+import typer
 from typer.testing import CliRunner
 
-from agent_skills_upd.cli.skill import app
+from agent_skills_upd.cli.skill import app, parse_clawdhub_skill_ref
 from agent_skills_upd.fetcher import ClawdhubFetchResult, ResourceType
 
 
@@ -91,3 +93,71 @@ def test_overwrite_flag_accepts_false():
         args, kwargs = mock_fetch.call_args
         assert args[2] is False
         assert kwargs == {}
+
+
+def test_multiple_refs_use_fetch_many():
+    """Several refs should be fetched together through fetch_many."""
+    runner = CliRunner()
+
+    with (
+        patch("agent_skills_upd.cli.skill.fetch_many") as mock_fetch_many,
+        patch("agent_skills_upd.cli.skill.fetch_resource") as mock_fetch,
+        patch("agent_skills_upd.cli.skill.fetch_spinner", return_value=nullcontext()),
+        patch("agent_skills_upd.cli.skill.print_success_message") as mock_print,
+    ):
+        mock_fetch_many.return_value = [Path("one"), Path("two")]
+
+        result = runner.invoke(app, ["user/one", "gitlab.com/user/two"])
+
+        assert result.exit_code == 0
+        mock_fetch.assert_not_called()
+        jobs = mock_fetch_many.call_args[0][0]
+        assert [job["name"] for job in jobs] == ["one", "two"]
+        assert [job["host"] for job in jobs] == ["github.com", "gitlab.com"]
+        assert mock_print.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "args,exit_code,message",
+    [
+        (["user"], 1, "Error: Invalid format: 'user'"),
+        (["user/one", "--overwrite=maybe"], 1, "Error: Invalid value for --overwrite"),
+        (["user/one", "--env", "nope"], 2, "Unknown environment: 'nope'"),
+    ],
+    ids=["bad-ref", "bad-overwrite", "unknown-env"],
+)
+def test_argument_errors(args, exit_code, message):
+    """Parse errors exit 1 with `Error: ...`; other usage errors stay typer's."""
+    runner = CliRunner()
+
+    with patch("agent_skills_upd.cli.skill.fetch_resource") as mock_fetch:
+        result = runner.invoke(app, args)
+
+    assert result.exit_code == exit_code
+    assert message in result.output
+    mock_fetch.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "ref,expected",
+    [
+        ("clawdhub.com/weather", "weather"),
+        ("https://clawdhub.com/weather/?tab=files", "weather"),
+        ("https://clawdhub.com.evil/weather", None),
+        ("https://clawd\thub.com/wea\nther", "weather"),
+        ("user/weather", None),
+    ],
+)
+def test_parse_clawdhub_skill_ref(ref, expected):
+    """Clawdhub refs yield the slug; anything else is left to other parsers."""
+    assert parse_clawdhub_skill_ref(ref) == expected
+
+
+@pytest.mark.parametrize(
+    "ref",
+    ["clawdhub.com/", "https://clawdhub.com/a/b", "\nhttps://\nclawdhub.com"],
+)
+def test_parse_clawdhub_skill_ref_invalid(ref):
+    """Clawdhub refs without exactly one slug segment are rejected."""
+    with pytest.raises(typer.BadParameter, match="Expected: clawdhub.com/<skill-name>"):
+        parse_clawdhub_skill_ref(ref)
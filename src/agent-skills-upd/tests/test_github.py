@@ -0,0 +1,62 @@
+"""Tests for GitHub CLI integration."""
+
+import json
+import subprocess
+from unittest.mock import patch
+
+from agent_skills_upd.github import create_github_repo, gh_preflight
+
+
+def completed(returncode: int, payload: dict | None = None, stderr: str = ""):
+    """Build a CompletedProcess like the one `gh api graphql` returns."""
+    stdout = json.dumps(payload) if payload is not None else ""
+    return subprocess.CompletedProcess(["gh"], returncode, stdout, stderr)
+
+
+def test_preflight_authenticated_repo_exists():
+    """A viewer with a repository id means the repo already exists."""
+    payload = {"data": {"viewer": {"login": "octocat", "repository": {"id": "R_1"}}}}
+
+    with patch("subprocess.run", return_value=completed(0, payload)) as mock_run:
+        assert gh_preflight() == (True, "octocat", True)
+
+    assert mock_run.call_count == 1
+    assert "r=agent-resources" in mock_run.call_args[0][0]
+
+
+def test_preflight_repo_missing():
+    """gh exits non-zero on NOT_FOUND but still returns the viewer."""
+    payload = {
+        "data": {"viewer": {"login": "octocat", "repository": None}},
+        "errors": [{"type": "NOT_FOUND"}],
+    }
+
+    with patch("subprocess.run", return_value=completed(1, payload)):
+        assert gh_preflight() == (True, "octocat", False)
+
+
+def test_preflight_not_authenticated():
+    """No data and a non-zero exit means gh is not logged in."""
+    result = completed(4, stderr="To get started with GitHub CLI, please run: gh auth login")
+
+    with patch("subprocess.run", return_value=result):
+        assert gh_preflight() == (False, None, False)
+
+
+def test_preflight_gh_missing():
+    """A missing gh binary is reported as unauthenticated."""
+    with patch("subprocess.run", side_effect=FileNotFoundError):
+        assert gh_preflight() == (False, None, False)
+
+
+def test_create_repo_uses_url_from_gh_output(tmp_path):
+    """The URL printed by `gh repo create` is returned without another gh call."""
+    result = subprocess.CompletedProcess(
+        ["gh"], 0, "https://github.com/octocat/agent-resources\n", ""
+    )
+
+    with patch("subprocess.run", return_value=result) as mock_run:
+        url = create_github_repo(tmp_path)
+
+    assert url == "https://github.com/octocat/agent-resources"
+    assert mock_run.call_count == 1
@@ -1,429 +1,650 @@
 """Integration tests that simulate real-world usage."""
 
-import sys
-import tempfile
+import io
+import json
+import os
+import shutil
 import tarfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch
 
-# Add src to path for non-installed testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
+from agent_skills_upd import fetcher
+from agent_skills_upd.cli import common
 from agent_skills_upd.cli.common import get_destination
-from agent_skills_upd.exceptions import ResourceNotFoundError
-from agent_skills_upd.fetcher import ResourceType, fetch_resource
-
-
-def create_mock_repo_tarball(
-    tmp_path: Path, repo_name: str, structure: str, skill_name: str = "test-skill"
-) -> bytes:
-    """Create a mock GitHub tarball with specified structure."""
-    repo_dir = tmp_path / f"{repo_name}-main"
-
-    if structure == "claude":
-        skill_dir = repo_dir / ".claude" / "skills" / skill_name
-        skill_dir.mkdir(parents=True)
-        (skill_dir / "SKILL.md").write_text("# Test Skill (Claude structure)")
-
-        cmd_dir = repo_dir / ".claude" / "commands"
-        cmd_dir.mkdir(parents=True)
-        (cmd_dir / "test-cmd.md").write_text("# Test Command (Claude structure)")
-
-    elif structure == "anthropic":
-        skill_dir = repo_dir / "skills" / skill_name
-        skill_dir.mkdir(parents=True)
-        (skill_dir / "SKILL.md").write_text("# Test Skill (Anthropic structure)")
-
-        cmd_dir = repo_dir / "commands"
-        cmd_dir.mkdir(parents=True)
-        (cmd_dir / "test-cmd.md").write_text("# Test Command (Anthropic structure)")
-
-    elif structure == "opencode":
-        skill_dir = repo_dir / "skill" / skill_name
-        skill_dir.mkdir(parents=True)
-        (skill_dir / "SKILL.md").write_text("# Test Skill (OpenCode structure)")
-
-        cmd_dir = repo_dir / "command"
-        cmd_dir.mkdir(parents=True)
-        (cmd_dir / "test-cmd.md").write_text("# Test Command (OpenCode structure)")
-    elif structure == "root":
-        repo_dir.mkdir(parents=True)
-        (repo_dir / "SKILL.md").write_text(
-            f"---\nname: {skill_name}\n---\n# Test Skill (Root structure)"
-        )
-        (repo_dir / "asset.txt").write_text("asset")
-        assets_dir = repo_dir / "assets"
-        assets_dir.mkdir()
-        (assets_dir / "note.txt").write_text("note")
-    elif structure == "rootdir":
-        skill_dir = repo_dir / skill_name
-        skill_dir.mkdir(parents=True)
-        (skill_dir / "SKILL.md").write_text("# Test Skill (Root dir structure)")
-
-    tarball_path = tmp_path / "repo.tar.gz"
-    with tarfile.open(tarball_path, "w:gz") as tar:
-        tar.add(repo_dir, arcname=f"{repo_name}-main")
-
-    return tarball_path.read_bytes()
-
-
-def test_backward_compatibility_claude_structure():
-    """Test backward compatibility with .claude/skills structure."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
-
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source", "agent-resources", "claude"
+from agent_skills_upd.exceptions import (
+    ResourceExistsError,
+    ResourceNotFoundError,
+    SkillUpdError,
+)
+from agent_skills_upd.fetcher import (
+    ResourceType,
+    extract_tarball_stream,
+    fetch_many,
+    fetch_resource,
+    find_resource_in_repo,
+    parse_frontmatter_name,
+    resource_member_filter,
+)
+
+TARBALL_URL = (
+    "https://codeload.github.com/testuser/agent-resources/tar.gz/refs/heads/main"
+)
+
+
+@pytest.mark.parametrize(
+    "user,repo,structure,marker",
+    [
+        ("testuser", "agent-resources", "claude", "Claude structure"),
+        ("anthropic", "skills", "anthropic", "Anthropic structure"),
+        ("opencode", "codingagents", "opencode", "OpenCode structure"),
+        ("testuser", "agent-resources", "rootdir", "Root dir structure"),
+    ],
+    ids=["claude", "anthropic", "opencode", "rootdir"],
+)
+def test_pattern_detection(
+    tmp_path, mock_tarballs, mocked_httpx, user, repo, structure, marker
+):
+    """Skills are found in .claude/skills/, skills/, skill/ and the repo root."""
+    dest_path = tmp_path / "destination"
+
+    with mocked_httpx(mock_tarballs[repo, structure]):
+        result = fetch_resource(
+            user,
+            "test-skill",
+            dest_path,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo=repo,
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+    assert result.name == "test-skill"
+    assert marker in (result / "SKILL.md").read_text()
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
-            result = fetch_resource(
-                "testuser",
-                "test-skill",
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="agent-resources",
-            )
+def test_custom_destination(tmp_path, mock_tarballs, mocked_httpx):
+    """Test custom destination path."""
+    custom_dest = tmp_path / "my-custom" / "location"
+
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+
+    with mocked_httpx(tarball_bytes):
+        result = fetch_resource(
+            "testuser",
+            "test-skill",
+            custom_dest,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo="agent-resources",
+        )
 
-            assert result.exists()
-            assert result.name == "test-skill"
-            assert (result / "SKILL.md").exists()
-            content = (result / "SKILL.md").read_text()
-            assert "Claude structure" in content
+        assert str(custom_dest) in str(result)
+        assert result.name == "test-skill"
+        assert "Claude structure" in (result / "SKILL.md").read_text()
 
 
-def test_anthropic_pattern_detection():
-    """Test pattern detection for Anthropic-style repos (skills/)."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
+# Fragments the not-found error must mention for a missing skill
+NOT_FOUND_NEEDLES = (
+    "Tried these locations:",
+    ".claude/skills/nonexistent",
+    "skills/nonexistent",
+    "skill/nonexistent",
+    "Quick fixes:",
+    "--repo",
+    "--dest",
+)
 
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source", "skills", "anthropic"
+
+def test_enhanced_error_messages(tmp_path, mocked_httpx):
+    """Test that error messages show all attempted patterns."""
+    dest_path = tmp_path / "destination"
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=0) as tar:
+        repo_root = tarfile.TarInfo("agent-resources-main")
+        repo_root.type = tarfile.DIRTYPE
+        tar.addfile(repo_root)
+    tarball_bytes = buffer.getvalue()
+
+    with mocked_httpx(tarball_bytes), pytest.raises(ResourceNotFoundError) as excinfo:
+        fetch_resource(
+            "testuser",
+            "nonexistent",
+            dest_path,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo="agent-resources",
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+    error_msg = str(excinfo.value)
+    missing = [needle for needle in NOT_FOUND_NEEDLES if needle not in error_msg]
+    assert not missing, f"Missing in error: {missing}"
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
-            result = fetch_resource(
-                "anthropic",
-                "test-skill",
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="skills",
+def test_server_error_is_reported(tmp_path, mocked_httpx, stub_response):
+    """A failed tarball download surfaces as SkillUpdError."""
+    with mocked_httpx(b"") as client:
+        client.tarballs = (stub_response(status_code=500),)
+        with pytest.raises(SkillUpdError, match="Failed to download repository"):
+            fetch_resource(
+                "testuser", "test-skill", tmp_path / "skills", ResourceType.SKILL
             )
 
-            assert result.exists()
-            assert result.name == "test-skill"
-            content = (result / "SKILL.md").read_text()
-            assert "Anthropic structure" in content
 
+def test_selective_extraction_skips_unrelated_members(tmp_path, mock_tarballs):
+    """Only the requested resource and the top-level layout are unpacked."""
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+    extract_path = tmp_path / "extracted"
+
+    extract_tarball_stream(
+        iter([tarball_bytes]),
+        extract_path,
+        resource_member_filter(
+            "agent-resources-main", ResourceType.SKILL, "test-skill"
+        ),
+    )
+
+    repo_dir = extract_path / "agent-resources-main"
+    assert (repo_dir / ".claude" / "skills" / "test-skill" / "SKILL.md").exists()
+    assert (repo_dir / ".claude" / "commands").is_dir()
+    assert not (repo_dir / ".claude" / "commands" / "test-cmd.md").exists()
+
+
+def test_extraction_skips_unsafe_members(tmp_path):
+    """Members escaping the extraction dir and special files are skipped."""
+    extract_path = tmp_path / "extracted"
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=0) as tar:
+        for name in ("repo-main/ok.md", "../escape.md", "/abs.md"):
+            info = tarfile.TarInfo(name)
+            info.size = 2
+            info.mode = 0o4777
+            tar.addfile(info, io.BytesIO(b"ok"))
+        link = tarfile.TarInfo("repo-main/link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "../../etc/passwd"
+        tar.addfile(link)
+        fifo = tarfile.TarInfo("repo-main/fifo")
+        fifo.type = tarfile.FIFOTYPE
+        tar.addfile(fifo)
+
+    extract_tarball_stream(iter([buffer.getvalue()]), extract_path)
+
+    assert sorted(p.name for p in extract_path.rglob("*")) == ["ok.md", "repo-main"]
+    assert (extract_path / "repo-main" / "ok.md").stat().st_mode & 0o7777 == 0o755
+    assert not (tmp_path / "escape.md").exists()
+
+
+@pytest.mark.parametrize(
+    "short", [("copy_file_range",), ("copy_file_range", "sendfile")]
+)
+def test_kernel_copy_falls_back_on_short_copy(tmp_path, monkeypatch, short):
+    """A kernel copy that stops early must not leave a truncated file."""
+    for syscall in short:
+        if hasattr(os, syscall):
+            monkeypatch.setattr(os, syscall, lambda *args: 0)
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(3 * 1024 + 7))
+
+    fetcher._kernel_copy(src, tmp_path / "dst.bin")
+
+    assert (tmp_path / "dst.bin").read_bytes() == src.read_bytes()
+
+
+def test_repo_index_sees_new_resources(tmp_path):
+    """Files added in a search directory invalidate the cached repo index."""
+    commands = tmp_path / "repo" / "commands"
+    commands.mkdir(parents=True)
+    (commands / "first.md").write_text("# First")
+    repo_dir = commands.parent
+    root_mtime = repo_dir.stat().st_mtime_ns
+
+    assert find_resource_in_repo(repo_dir, ResourceType.COMMAND, "second") is None
+
+    (commands / "second.md").write_text("# Second")
+    os.utime(repo_dir, ns=(root_mtime, root_mtime))
+
+    assert find_resource_in_repo(repo_dir, ResourceType.COMMAND, "second") == (
+        commands / "second.md"
+    )
+
+
+INVALID_FRONTMATTER = "Root SKILL.md frontmatter is invalid."
+
+
+@pytest.mark.parametrize(
+    "frontmatter,expected",
+    [
+        ("name: weather", ("weather", None)),
+        ("name: 'weather'  # slug", ("weather", None)),
+        ("name:weather", (None, "Root SKILL.md frontmatter missing name.")),
+        ("name: first\nname: second", ("second", None)),
+        ("name: first\n\"name\": second", ("second", None)),
+        ("name: weather\n  bad: indent", (None, INVALID_FRONTMATTER)),
+        ("name: weather\nmeta:\n\tkey: value", (None, INVALID_FRONTMATTER)),
+        ("name: weather\ndescription: a: b", (None, INVALID_FRONTMATTER)),
+    ],
+    ids=[
+        "plain",
+        "quoted",
+        "no-space",
+        "duplicate",
+        "duplicate-quoted",
+        "bad-indent",
+        "tab-indent",
+        "ambiguous-scalar",
+    ],
+)
+def test_parse_frontmatter_name(tmp_path, frontmatter, expected):
+    """The regex fast path agrees with the YAML parser."""
+    skill_file = tmp_path / "SKILL.md"
+    skill_file.write_text(f"---\n{frontmatter}\n---\n# Skill\n")
+
+    assert parse_frontmatter_name(skill_file) == expected
+
+
+def test_parse_frontmatter_name_needs_exact_opener(tmp_path):
+    """`---x` doesn't open a frontmatter block."""
+    skill_file = tmp_path / "SKILL.md"
+    skill_file.write_text("---x\nname: weather\n---\n# Skill\n")
+
+    assert parse_frontmatter_name(skill_file) == (
+        None,
+        "Root SKILL.md frontmatter missing name.",
+    )
+
+
+def test_manual_repo_override_root_skill(tmp_path, mock_tarballs, mocked_httpx):
+    """Test root-level SKILL.md handling for manual repo overrides."""
+    dest_path = tmp_path / "destination"
+
+    tarball_bytes = mock_tarballs["custom-skill", "root", "root-skill"]
+
+    with mocked_httpx(tarball_bytes):
+        result = fetch_resource(
+            "testuser",
+            "root-skill",
+            dest_path,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo="custom-skill",
+        )
+
+        assert result.name == "root-skill"
+        content = (result / "SKILL.md").read_text()
+        assert "Root structure" in content
+        assert (result / "asset.txt").read_text() == "asset"
+        assert (result / "assets" / "note.txt").read_text() == "note"
 
-def test_opencode_pattern_detection():
-    """Test pattern detection for OpenCode-style repos (skill/)."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
 
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source", "codingagents", "opencode"
+def test_manual_repo_override_root_skill_derive_name(
+    tmp_path, mock_tarballs, mocked_httpx
+):
+    """Test root-level SKILL.md name derivation for manual repo overrides."""
+    dest_path = tmp_path / "destination"
+
+    tarball_bytes = mock_tarballs["custom-skill", "root", "root-derived"]
+
+    with mocked_httpx(tarball_bytes):
+        result = fetch_resource(
+            "testuser",
+            None,
+            dest_path,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo="custom-skill",
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+        assert result.name == "root-derived"
+        content = (result / "SKILL.md").read_text()
+        assert "Root structure" in content
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
-            result = fetch_resource(
-                "opencode",
-                "test-skill",
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="codingagents",
-            )
+def test_manual_repo_override_root_skill_name_mismatch(
+    tmp_path, mock_tarballs, mocked_httpx
+):
+    """Test error messages when root SKILL.md name mismatches."""
+    dest_path = tmp_path / "destination"
+
+    tarball_bytes = mock_tarballs["custom-skill", "root", "actual-skill"]
+
+    with mocked_httpx(tarball_bytes), pytest.raises(ResourceNotFoundError) as excinfo:
+        fetch_resource(
+            "testuser",
+            "requested-skill",
+            dest_path,
+            ResourceType.SKILL,
+            overwrite=False,
+            repo="custom-skill",
+        )
 
-            assert result.exists()
-            assert result.name == "test-skill"
-            content = (result / "SKILL.md").read_text()
-            assert "OpenCode structure" in content
+    error_msg = str(excinfo.value)
+    assert "Manual repo override check:" in error_msg
+    assert (
+        "frontmatter name 'actual-skill' does not match requested 'requested-skill'"
+        in error_msg
+    )
 
 
-def test_root_dir_pattern_detection():
-    """Test pattern detection for root-level skill directories."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
+def test_etag_revalidation_reuses_cached_tarball(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response
+):
+    """A 304 for the cached ETag should install from the cached tarball."""
+    dest_path = tmp_path / "destination"
 
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source", "agent-resources", "rootdir"
-        )
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+    not_modified = stub_response(status_code=304, headers={"etag": '"v1"'})
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+    with mocked_httpx(
+        tarball_bytes, headers={"etag": '"v1"'}, then=(not_modified,)
+    ) as client:
+        fetch_resource("testuser", "test-skill", dest_path, ResourceType.SKILL)
+        assert list(isolated_cache.glob("*.tar.gz"))
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+        # A later invocation revalidates instead of trusting the cache
+        fetcher._CURRENT_TARBALLS.clear()
 
-            result = fetch_resource(
-                "testuser",
-                "test-skill",
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="agent-resources",
-            )
+        result = fetch_resource(
+            "testuser", "test-skill", dest_path, ResourceType.SKILL
+        )
 
-            assert result.exists()
-            assert result.name == "test-skill"
-            content = (result / "SKILL.md").read_text()
-            assert "Root dir structure" in content
+        assert client.stream_headers == [None, {"If-None-Match": '"v1"'}]
+        assert "Claude structure" in (result / "SKILL.md").read_text()
+        assert not_modified.reads == 0
 
 
-def test_custom_destination():
-    """Test custom destination path."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        custom_dest = tmp_path / "my-custom" / "location"
+def test_sibling_fetch_reuses_extracted_tree(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx
+):
+    """A second resource from a just-downloaded repo needs no request."""
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
 
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source", "agent-resources", "claude"
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        fetch_resource(
+            "testuser", "test-skill", tmp_path / "skills", ResourceType.SKILL
+        )
+        command = fetch_resource(
+            "testuser", "test-cmd", tmp_path / "commands", ResourceType.COMMAND
+        )
+        again = fetch_resource(
+            "testuser", "test-cmd", tmp_path / "again", ResourceType.COMMAND
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+    assert len(client.streamed) == 1
+    assert "Claude structure" in command.read_text()
+    assert again.read_text() == command.read_text()
+    (tree,) = (isolated_cache / "trees").iterdir()
+    assert (tree / "agent-resources-main" / ".claude" / "commands").is_dir()
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
-            result = fetch_resource(
-                "testuser",
-                "test-skill",
-                custom_dest,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="agent-resources",
-            )
+@pytest.mark.parametrize(
+    "headers", [{"etag": '"v2"'}, {}], ids=["new-etag", "no-validators"]
+)
+def test_new_version_drops_superseded_cache(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response, headers
+):
+    """A changed repo leaves no tree (or uncached tarball) of the old version."""
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
 
-            assert result.exists()
-            assert str(custom_dest) in str(result)
-            assert result.name == "test-skill"
+    with mocked_httpx(
+        tarball_bytes,
+        headers={"etag": '"v1"'},
+        then=(stub_response(tarball_bytes, headers=headers),),
+    ) as client:
+        fetch_resource("testuser", "test-cmd", tmp_path / "a", ResourceType.COMMAND)
+        fetch_resource("testuser", "test-skill", tmp_path / "b", ResourceType.SKILL)
+        assert len(list((isolated_cache / "trees").iterdir())) == 1
 
+        fetcher._CURRENT_TARBALLS.clear()
+        fetch_resource("testuser", "test-skill", tmp_path / "c", ResourceType.SKILL)
 
-def test_enhanced_error_messages():
-    """Test that error messages show all attempted patterns."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
-
-        repo_dir = tmp_path / "source" / "agent-resources-main"
-        repo_dir.mkdir(parents=True)
-
-        tarball_path = tmp_path / "repo.tar.gz"
-        with tarfile.open(tarball_path, "w:gz") as tar:
-            tar.add(repo_dir, arcname="agent-resources-main")
-
-        tarball_bytes = tarball_path.read_bytes()
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-
-            try:
-                fetch_resource(
-                    "testuser",
-                    "nonexistent",
-                    dest_path,
-                    ResourceType.SKILL,
-                    overwrite=False,
-                    repo="agent-resources",
-                )
-                assert False, "Should have raised ResourceNotFoundError"
-            except ResourceNotFoundError as exc:
-                error_msg = str(exc)
-                assert "Tried these locations:" in error_msg
-                assert ".claude/skills/nonexistent" in error_msg
-                assert "skills/nonexistent" in error_msg
-                assert "skill/nonexistent" in error_msg
-                assert "Quick fixes:" in error_msg
-                assert "--repo" in error_msg
-                assert "--dest" in error_msg
-
-
-def test_manual_repo_override_root_skill():
-    """Test root-level SKILL.md handling for manual repo overrides."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
-
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source",
-            "custom-skill",
-            "root",
-            skill_name="root-skill",
+    assert len(client.streamed) == 2
+    assert not list((isolated_cache / "trees").iterdir())
+    assert len(list(isolated_cache.glob("*.tar.gz"))) == (1 if headers else 0)
+
+
+def test_unchanged_repo_skips_download(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response
+):
+    """A resource tagged with the upstream ETag is kept after a HEAD request."""
+    dest_path = tmp_path / "skills"
+
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        client.routes["HEAD", TARBALL_URL] = stub_response(headers={"etag": '"v1"'})
+
+        first = fetch_resource(
+            "testuser", "test-skill", dest_path, ResourceType.SKILL
+        )
+        fetcher._CURRENT_TARBALLS.clear()
+        second = fetch_resource(
+            "testuser", "test-skill", dest_path, ResourceType.SKILL
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
+    assert first == second
+    assert client.streamed == [TARBALL_URL]
+    assert client.requested == [("HEAD", TARBALL_URL)]
+    assert not (dest_path / ".agent-skills-upd.json").exists()
+    installed = json.loads((isolated_cache / "installed.json").read_text())
+    assert installed[str(first)]["etag"] == '"v1"'
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
-            result = fetch_resource(
-                "testuser",
-                "root-skill",
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="custom-skill",
-            )
+@pytest.mark.parametrize("change", ["edit", "delete"])
+def test_changed_install_is_refetched(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response, change
+):
+    """An unchanged ETag doesn't keep a resource the user edited or removed."""
+    dest_path = tmp_path / "skills"
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
 
-            assert result.exists()
-            assert result.name == "root-skill"
-            content = (result / "SKILL.md").read_text()
-            assert "Root structure" in content
-            assert (result / "asset.txt").read_text() == "asset"
-            assert (result / "assets" / "note.txt").read_text() == "note"
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        client.routes["HEAD", TARBALL_URL] = stub_response(headers={"etag": '"v1"'})
 
+        skill = fetch_resource("testuser", "test-skill", dest_path, ResourceType.SKILL)
+        if change == "edit":
+            (skill / "SKILL.md").write_text("# Local edits")
+        else:
+            shutil.rmtree(skill)
+        fetcher._CURRENT_TARBALLS.clear()
+        fetch_resource("testuser", "test-skill", dest_path, ResourceType.SKILL)
 
-def test_manual_repo_override_root_skill_derive_name():
-    """Test root-level SKILL.md name derivation for manual repo overrides."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
-
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source",
-            "custom-skill",
-            "root",
-            skill_name="root-derived",
-        )
+    assert "Claude structure" in (skill / "SKILL.md").read_text()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
 
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+def test_known_layout_fetches_single_file(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response
+):
+    """Once a repo's command directory is known, later runs fetch just the file."""
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
 
-            result = fetch_resource(
-                "testuser",
-                None,
-                dest_path,
-                ResourceType.SKILL,
-                overwrite=False,
-                repo="custom-skill",
+    raw_url = (
+        "https://raw.githubusercontent.com/testuser/agent-resources/main/"
+        ".claude/commands/test-cmd.md"
+    )
+
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        client.routes["GET", raw_url] = stub_response(b"# Updated command")
+
+        fetch_resource(
+            "testuser", "test-cmd", tmp_path / "commands", ResourceType.COMMAND
+        )
+        fetcher._CURRENT_TARBALLS.clear()
+        result = fetch_resource(
+            "testuser", "test-cmd", tmp_path / "commands", ResourceType.COMMAND
+        )
+
+    assert client.streamed == [TARBALL_URL]
+    assert client.requested == [("HEAD", TARBALL_URL), ("GET", raw_url)]
+    assert result.read_text() == "# Updated command"
+
+
+def test_known_layout_records_install(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response
+):
+    """A file fetched on its own is tagged with the ETag the HEAD returned."""
+    dest_path = tmp_path / "commands"
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+
+    raw_url = (
+        "https://raw.githubusercontent.com/testuser/agent-resources/main/"
+        ".claude/commands/test-cmd.md"
+    )
+
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        client.routes["HEAD", TARBALL_URL] = stub_response(headers={"etag": '"v2"'})
+        client.routes["GET", raw_url] = stub_response(b"# Updated command")
+
+        for _ in range(3):
+            fetcher._CURRENT_TARBALLS.clear()
+            fetch_resource("testuser", "test-cmd", dest_path, ResourceType.COMMAND)
+
+    assert client.streamed == [TARBALL_URL]
+    assert client.requested == [
+        ("HEAD", TARBALL_URL),
+        ("GET", raw_url),
+        ("HEAD", TARBALL_URL),
+    ]
+
+
+def test_secondary_layout_fetches_tarball(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx
+):
+    """Outside the first search location a higher-priority file could win."""
+    tarball_bytes = mock_tarballs["agent-resources", "anthropic"]
+
+    with mocked_httpx(tarball_bytes, headers={"etag": '"v1"'}) as client:
+        for _ in range(2):
+            fetcher._CURRENT_TARBALLS.clear()
+            fetch_resource(
+                "testuser", "test-cmd", tmp_path / "commands", ResourceType.COMMAND
             )
 
-            assert result.exists()
-            assert result.name == "root-derived"
-            content = (result / "SKILL.md").read_text()
-            assert "Root structure" in content
+    assert client.streamed == [TARBALL_URL, TARBALL_URL]
+    assert not any(method == "GET" for method, _ in client.requested)
 
 
-def test_manual_repo_override_root_skill_name_mismatch():
-    """Test error messages when root SKILL.md name mismatches."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        dest_path = tmp_path / "destination"
-
-        tarball_bytes = create_mock_repo_tarball(
-            tmp_path / "source",
-            "custom-skill",
-            "root",
-            skill_name="actual-skill",
+def test_last_modified_revalidation_uses_etag_index(
+    tmp_path, isolated_cache, mock_tarballs, mocked_httpx, stub_response
+):
+    """Without an ETag, Last-Modified is stored and sent as If-Modified-Since."""
+    dest_path = tmp_path / "destination"
+    last_modified = "Wed, 01 Oct 2025 08:00:00 GMT"
+
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+
+    with mocked_httpx(
+        tarball_bytes,
+        headers={"last-modified": last_modified},
+        then=(stub_response(status_code=304),),
+    ) as client:
+
+        fetch_resource("testuser", "test-skill", dest_path, ResourceType.SKILL)
+        index = json.loads((isolated_cache / "etags.json").read_text())
+        (entry,) = index.values()
+        assert entry["last_modified"] == last_modified
+        assert entry["etag"] is None
+
+        fetcher._CURRENT_TARBALLS.clear()
+
+        result = fetch_resource(
+            "testuser", "test-skill", dest_path, ResourceType.SKILL
         )
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = tarball_bytes
-
-        with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-
-            try:
-                fetch_resource(
-                    "testuser",
-                    "requested-skill",
-                    dest_path,
-                    ResourceType.SKILL,
-                    overwrite=False,
-                    repo="custom-skill",
-                )
-                assert False, "Should have raised ResourceNotFoundError"
-            except ResourceNotFoundError as exc:
-                error_msg = str(exc)
-                assert "Manual repo override check:" in error_msg
-                assert (
-                    "frontmatter name 'actual-skill' does not match requested 'requested-skill'"
-                    in error_msg
-                )
-
-
-def test_amp_environment_destinations():
-    """Test destination resolution for Amp environments."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        home_dir = tmp_path / "home"
-        cwd_dir = tmp_path / "project"
-        home_dir.mkdir()
-        cwd_dir.mkdir()
-
-        with (
-            patch("agent_skills_upd.cli.common.Path.home", return_value=home_dir),
-            patch("agent_skills_upd.cli.common.Path.cwd", return_value=cwd_dir),
-        ):
-            for env_name in ("amp", "ampcode"):
-                dest = get_destination("skills", False, environment=env_name)
-                assert dest == cwd_dir / ".agents/skills"
-
-                dest = get_destination("skills", True, environment=env_name)
-                assert dest == home_dir / ".config/agents/skills"
-
-
-def test_clawdbot_environment_destinations():
-    """Test destination resolution for ClawdBot environments."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        home_dir = tmp_path / "home"
-        cwd_dir = tmp_path / "project"
-        home_dir.mkdir()
-        cwd_dir.mkdir()
-
-        with (
-            patch("agent_skills_upd.cli.common.Path.home", return_value=home_dir),
-            patch("agent_skills_upd.cli.common.Path.cwd", return_value=cwd_dir),
-        ):
-            for env_name in ("clawdbot", "clawdis", "clawd"):
-                dest = get_destination("skills", False, environment=env_name)
-                assert dest == cwd_dir / "skills"
-
-                dest = get_destination("skills", True, environment=env_name)
-                assert dest == home_dir / ".config/clawdbot/skills"
+        assert client.stream_headers[1] == {"If-Modified-Since": last_modified}
+        assert (result / "SKILL.md").exists()
 
 
-if __name__ == "__main__":
-    import pytest
+def test_fetch_many_downloads_concurrently(tmp_path, mock_tarballs, mocked_httpx):
+    """fetch_many shares one async client and reports failures per job."""
+    dest_path = tmp_path / "destination"
 
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+
+    with mocked_httpx(tarball_bytes) as client:
+        results = fetch_many(
+            [
+                {
+                    "username": "testuser",
+                    "name": name,
+                    "dest": dest_path,
+                    "resource_type": ResourceType.SKILL,
+                }
+                for name in ("test-skill", "missing-skill")
+            ]
+        )
+
+    assert client.streamed == [TARBALL_URL, TARBALL_URL]
+    assert (results[0] / "SKILL.md").exists()
+    assert isinstance(results[1], ResourceNotFoundError)
+
+
+def test_fetch_many_deduplicates_destinations(tmp_path, mock_tarballs, mocked_httpx):
+    """Jobs for one destination don't race: repeats share, other sources fail."""
+    dest_path = tmp_path / "destination"
+
+    tarball_bytes = mock_tarballs["agent-resources", "claude"]
+    job = {
+        "username": "testuser",
+        "name": "test-skill",
+        "dest": dest_path,
+        "resource_type": ResourceType.SKILL,
+    }
+
+    with mocked_httpx(tarball_bytes) as client:
+        results = fetch_many([job, dict(job), {**job, "username": "otheruser"}])
+
+    assert client.streamed == [TARBALL_URL]
+    assert results[0] == results[1] == dest_path / "test-skill"
+    assert isinstance(results[2], ResourceExistsError)
+    assert "testuser/agent-resources" in str(results[2])
+
+
+@pytest.fixture
+def patched_paths(tmp_path, monkeypatch):
+    """Point the home and current directories at fresh temp dirs."""
+    home_dir = tmp_path / "home"
+    cwd_dir = tmp_path / "project"
+    home_dir.mkdir()
+    cwd_dir.mkdir()
+
+    # _HOME and _CONFIG_PATH are read from Path.home() at import, so $HOME
+    # alone wouldn't reach them
+    monkeypatch.setenv("HOME", str(home_dir))
+    monkeypatch.setattr(common, "_HOME", home_dir)
+    monkeypatch.setattr(
+        common, "_CONFIG_PATH", home_dir / ".agent-resources-config.yaml"
+    )
+    common._load_environments.cache_clear()
+    monkeypatch.chdir(cwd_dir)
+    return home_dir, Path.cwd()
+
+
+# (environment, global install, expected path under the cwd or home)
+DESTINATION_CASES = [
+    ("amp", False, ".agents/skills"),
+    ("amp", True, ".config/agents/skills"),
+    ("ampcode", False, ".agents/skills"),
+    ("ampcode", True, ".config/agents/skills"),
+    ("clawdbot", False, "skills"),
+    ("clawdbot", True, ".config/clawdbot/skills"),
+    ("clawdis", False, "skills"),
+    ("clawdis", True, ".config/clawdbot/skills"),
+    ("clawd", False, "skills"),
+    ("clawd", True, ".config/clawdbot/skills"),
+]
+
+
+@pytest.mark.parametrize("env_name,global_install,expected", DESTINATION_CASES)
+def test_environment_destinations(patched_paths, env_name, global_install, expected):
+    """Test destination resolution for Amp and ClawdBot environments."""
+    home_dir, cwd_dir = patched_paths
+    base = home_dir if global_install else cwd_dir
+
+    dest = get_destination("skills", global_install, environment=env_name)
+    assert dest == base / expected
+
+
+if __name__ == "__main__":
     pytest.main([__file__, "-v"])